@@ -0,0 +1,9 @@
+"""
+Runs the command line interface of fsc.hdf5_io.
+"""
+
+import sys
+
+from ._cli import main
+
+sys.exit(main())
@@ -0,0 +1,792 @@
+"""
+Defines storage backends other than HDF5 files. The stores expose groups and
+datasets with the subset of the :py:class:`h5py.Group<Group>` and
+:py:class:`h5py.Dataset<Dataset>` interface used by the serialization
+functions, such that all serializers can target them unchanged.
+"""
+
+import abc
+import base64
+import json
+import os
+import shutil
+import warnings
+
+import h5py
+import numpy as np
+
+from fsc.export import export
+
+__all__ = []
+
+_BACKENDS = {}
+
+
+@export
+def register_backend(name):
+    """
+    Decorator which registers a storage backend under the given name, for
+    use as the ``backend`` argument of :func:`.to_hdf5_file` and
+    :func:`.from_hdf5_file`.
+
+    The decorated object is called with the path and the mode (``'r'``,
+    ``'w'`` or ``'a'``), and must return a :class:`Store`.
+
+    :param name: Name of the backend.
+    :type name: str
+    """
+
+    def inner(factory):
+        if name in _BACKENDS:
+            raise ValueError(f"The backend '{name}' exists already.")
+        _BACKENDS[name] = factory
+        return factory
+
+    return inner
+
+
+def open_store(target, mode, backend=None):
+    """
+    Returns the store for the given target, which can be a path or a
+    :class:`Store` instance.
+    """
+    if isinstance(target, Store):
+        return target
+    try:
+        factory = _BACKENDS[backend]
+    except KeyError as err:
+        raise ValueError(
+            f"Unknown backend '{backend}', must be one of {sorted(_BACKENDS)}."
+        ) from err
+    return factory(target, mode)
+
+
+@export
+class Store(abc.ABC):
+    """
+    Base class for storage backends. A store holds groups and arrays in a
+    hierarchy of '/'-separated paths, where the root group has the path
+    ``''``. The groups and datasets with a h5py-like interface are obtained
+    from :attr:`root`.
+
+    Attributes are cached by the store, and written when the store is
+    flushed or closed. Stores can be used as context managers, which close
+    the store on exit.
+    """
+
+    driver = None
+
+    def __init__(self):
+        self._attrs_cache = {}
+        self._dirty_attrs = set()
+
+    @property
+    def root(self):
+        """
+        The root group of the store.
+        """
+        return StoreGroup(self, "")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def flush(self):
+        """
+        Writes the modified attributes to the store.
+        """
+        for path in sorted(self._dirty_attrs):
+            self._save_attrs(path, self._attrs_cache[path])
+        self._dirty_attrs.clear()
+
+    def close(self):
+        """
+        Flushes and closes the store.
+        """
+        self.flush()
+
+    def get_attrs(self, path):
+        """
+        Returns the (cached) attributes of the group or array at ``path``.
+        """
+        if path not in self._attrs_cache:
+            self._attrs_cache[path] = {
+                key: _decode_attr(value)
+                for key, value in self._load_attrs(path).items()
+            }
+        return self._attrs_cache[path]
+
+    def set_attr(self, path, name, value):
+        """
+        Sets an attribute of the group or array at ``path``.
+        """
+        encoded = _encode_attr(value)
+        self.get_attrs(path)[name] = _decode_attr(encoded)
+        self._dirty_attrs.add(path)
+
+    def delete_attr(self, path, name):
+        """
+        Deletes an attribute of the group or array at ``path``.
+        """
+        del self.get_attrs(path)[name]
+        self._dirty_attrs.add(path)
+
+    @abc.abstractmethod
+    def is_group(self, path):
+        """
+        Returns whether a group exists at ``path``.
+        """
+
+    @abc.abstractmethod
+    def is_array(self, path):
+        """
+        Returns whether an array exists at ``path``.
+        """
+
+    @abc.abstractmethod
+    def list_members(self, path):
+        """
+        Returns the names of the members of the group at ``path``.
+        """
+
+    @abc.abstractmethod
+    def create_group(self, path):
+        """
+        Creates a group at ``path``.
+        """
+
+    @abc.abstractmethod
+    def create_array(self, path, data=None, shape=None, dtype=None):
+        """
+        Creates an array at ``path``, either from the given data or filled
+        with zeros.
+        """
+
+    @abc.abstractmethod
+    def array_info(self, path):
+        """
+        Returns the shape and dtype of the array at ``path``.
+        """
+
+    @abc.abstractmethod
+    def read(self, path, selection):
+        """
+        Reads the given selection of the array at ``path``.
+        """
+
+    @abc.abstractmethod
+    def write(self, path, selection, value):
+        """
+        Writes to the given selection of the array at ``path``.
+        """
+
+    @abc.abstractmethod
+    def _load_attrs(self, path):
+        """
+        Loads the encoded attributes of the group or array at ``path``.
+        """
+
+    @abc.abstractmethod
+    def _save_attrs(self, path, attrs):
+        """
+        Saves the attributes of the group or array at ``path``.
+        """
+
+
+@register_backend("directory")
+@export
+class DirectoryStore(Store):
+    """
+    Store which maps groups to directories and arrays to ``.npy`` files.
+    Since every array is a separate file, different processes can write
+    to different groups of the same store without locking.
+
+    :param path: Path of the root directory.
+    :type path: str
+
+    :param mode: ``'r'`` to read, ``'w'`` to create (replacing an existing directory store), or ``'a'`` to modify an existing store.
+    :type mode: str
+    """
+
+    driver = "directory"
+    _MARKER_FILE = ".fsc_hdf5_io_store"
+    _ATTRS_FILE = ".attrs.json"
+
+    def __init__(self, path, mode="r"):
+        super().__init__()
+        self._path = os.path.abspath(os.fspath(path))
+        self._writable = mode != "r"
+        if mode == "w":
+            if os.path.exists(self._path):
+                if not os.path.exists(os.path.join(self._path, self._MARKER_FILE)):
+                    raise FileExistsError(
+                        f"Cannot overwrite '{self._path}', since it is not a directory store."
+                    )
+                shutil.rmtree(self._path)
+            os.makedirs(self._path)
+            with open(os.path.join(self._path, self._MARKER_FILE), "w"):
+                pass
+        elif mode in ("r", "a"):
+            if not os.path.isdir(self._path):
+                raise FileNotFoundError(f"Directory store '{self._path}' not found.")
+        else:
+            raise ValueError(f"Invalid mode '{mode}'.")
+
+    def _fs_path(self, path):
+        return os.path.join(self._path, *path.split("/")) if path else self._path
+
+    def _array_file(self, path):
+        return self._fs_path(path) + ".npy"
+
+    def is_group(self, path):
+        return os.path.isdir(self._fs_path(path))
+
+    def is_array(self, path):
+        return bool(path) and os.path.isfile(self._array_file(path))
+
+    def list_members(self, path):
+        res = []
+        for name in os.listdir(self._fs_path(path)):
+            if name.startswith("."):
+                continue
+            if name.endswith(".npy"):
+                name = name[: -len(".npy")]
+            res.append(name)
+        return res
+
+    def create_group(self, path):
+        os.mkdir(self._fs_path(path))
+
+    def create_array(self, path, data=None, shape=None, dtype=None):
+        if data is not None:
+            np.save(self._array_file(path), data, allow_pickle=False)
+        else:
+            np.lib.format.open_memmap(
+                self._array_file(path), mode="w+", shape=shape, dtype=dtype
+            ).flush()
+
+    def _load(self, path, mmap_mode="r"):
+        try:
+            return np.load(
+                self._array_file(path), mmap_mode=mmap_mode, allow_pickle=False
+            )
+        except ValueError:
+            # empty arrays cannot be memory-mapped
+            return np.load(self._array_file(path), allow_pickle=False)
+
+    def array_info(self, path):
+        array = self._load(path)
+        return array.shape, array.dtype
+
+    def read(self, path, selection):
+        res = self._load(path)[selection]
+        if isinstance(res, np.ndarray):
+            return np.array(res)
+        return res
+
+    def write(self, path, selection, value):
+        array = self._load(path, mmap_mode="r+")
+        array[selection] = value
+        if isinstance(array, np.memmap):
+            array.flush()
+
+    def _load_attrs(self, path):
+        attrs_file = self._attrs_file(path)
+        if not os.path.exists(attrs_file):
+            return {}
+        with open(attrs_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_attrs(self, path, attrs):
+        with open(self._attrs_file(path), "w", encoding="utf-8") as f:
+            json.dump({key: _encode_attr(value) for key, value in attrs.items()}, f)
+
+    def _attrs_file(self, path):
+        if self.is_array(path):
+            return self._fs_path(path) + self._ATTRS_FILE
+        return os.path.join(self._fs_path(path), self._ATTRS_FILE)
+
+    def close(self):
+        if self._writable:
+            super().close()
+
+
+@export
+class MemoryStore(Store):
+    """
+    Store which keeps all groups and arrays in memory.
+    """
+
+    driver = "memory"
+
+    def __init__(self):
+        super().__init__()
+        self._groups = {""}
+        self._arrays = {}
+        self._attrs = {}
+
+    def is_group(self, path):
+        return path in self._groups
+
+    def is_array(self, path):
+        return path in self._arrays
+
+    def list_members(self, path):
+        prefix = path + "/" if path else ""
+        return [
+            member[len(prefix) :]
+            for member in list(self._groups) + list(self._arrays)
+            if member.startswith(prefix)
+            and member != path
+            and "/" not in member[len(prefix) :]
+        ]
+
+    def create_group(self, path):
+        self._groups.add(path)
+
+    def create_array(self, path, data=None, shape=None, dtype=None):
+        if data is not None:
+            self._arrays[path] = np.array(data)
+        else:
+            self._arrays[path] = np.zeros(shape, dtype=dtype)
+
+    def array_info(self, path):
+        array = self._arrays[path]
+        return array.shape, array.dtype
+
+    def read(self, path, selection):
+        res = self._arrays[path][selection]
+        if isinstance(res, np.ndarray):
+            return res.copy()
+        return res
+
+    def write(self, path, selection, value):
+        self._arrays[path][selection] = value
+
+    def _load_attrs(self, path):
+        return self._attrs.get(path, {})
+
+    def _save_attrs(self, path, attrs):
+        self._attrs[path] = {key: _encode_attr(value) for key, value in attrs.items()}
+
+
+@register_backend("zarr")
+@export
+class ZarrStore(Store):
+    """
+    Store which uses a `zarr <https://zarr.dev>`_ group. Requires the
+    ``zarr`` package.
+
+    :param path: Path of the zarr group, or any store accepted by :py:func:`zarr.open_group`.
+
+    :param mode: The mode in which the group is opened.
+    :type mode: str
+    """
+
+    driver = "zarr"
+    _ATTRS_KEY = "fsc.hdf5_io"
+
+    def __init__(self, path, mode="r"):
+        import zarr  # pylint: disable=import-outside-toplevel
+
+        super().__init__()
+        self._zarr = zarr
+        self._group = zarr.open_group(path, mode=mode)
+
+    def _get(self, path):
+        return self._group[path] if path else self._group
+
+    def _exists(self, path):
+        return not path or path in self._group
+
+    def is_group(self, path):
+        return self._exists(path) and isinstance(self._get(path), self._zarr.Group)
+
+    def is_array(self, path):
+        return self._exists(path) and isinstance(self._get(path), self._zarr.Array)
+
+    def list_members(self, path):
+        return list(self._get(path).keys())
+
+    def create_group(self, path):
+        self._group.create_group(path)
+
+    def create_array(self, path, data=None, shape=None, dtype=None):
+        # Fixed-length strings are not part of the zarr v3 specification
+        # yet, but are only read back by this library.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            if data is not None:
+                self._group.create_array(path, data=data)
+            else:
+                self._group.create_array(path, shape=shape, dtype=dtype, fill_value=0)
+
+    def array_info(self, path):
+        array = self._get(path)
+        return array.shape, np.dtype(array.dtype)
+
+    def read(self, path, selection):
+        return self._get(path)[selection]
+
+    def write(self, path, selection, value):
+        self._get(path)[selection] = value
+
+    def _load_attrs(self, path):
+        return dict(self._get(path).attrs.get(self._ATTRS_KEY, {}))
+
+    def _save_attrs(self, path, attrs):
+        self._get(path).attrs[self._ATTRS_KEY] = {
+            key: _encode_attr(value) for key, value in attrs.items()
+        }
+
+
+class _StoreObject:
+    """
+    Base class for groups and datasets of a store.
+    """
+
+    def __init__(self, store, path):
+        self._store = store
+        self._path = path
+
+    @property
+    def name(self):
+        """
+        The full name of the object.
+        """
+        return "/" + self._path
+
+    @property
+    def file(self):
+        """
+        The store containing the object.
+        """
+        return self._store
+
+    @property
+    def attrs(self):
+        """
+        The attributes of the object.
+        """
+        return StoreAttributes(self._store, self._path)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, _StoreObject)
+            and self._store is other._store
+            and self._path == other._path
+        )
+
+    def __hash__(self):
+        return hash((id(self._store), self._path))
+
+
+class StoreGroup(_StoreObject):
+    """
+    Group of a :class:`Store`, with a h5py-like interface.
+    """
+
+    def _child_path(self, name):
+        if not isinstance(name, str):
+            raise TypeError(f"Invalid group member name '{name}'.")
+        name = name.strip("/")
+        if not name or any(part.startswith(".") for part in name.split("/")):
+            raise ValueError(f"Invalid group member name '{name}'.")
+        return f"{self._path}/{name}" if self._path else name
+
+    def __getitem__(self, name):
+        path = self._child_path(name)
+        if self._store.is_group(path):
+            return StoreGroup(self._store, path)
+        if self._store.is_array(path):
+            return StoreDataset(self._store, path)
+        raise KeyError(f"Object '{name}' does not exist in group '{self.name}'.")
+
+    def __setitem__(self, name, value):
+        self.create_dataset(name, data=value)
+
+    def __contains__(self, name):
+        try:
+            path = self._child_path(name)
+        except (TypeError, ValueError):
+            return False
+        return self._store.is_group(path) or self._store.is_array(path)
+
+    def __iter__(self):
+        return iter(sorted(self._store.list_members(self._path)))
+
+    def __len__(self):
+        return len(self._store.list_members(self._path))
+
+    def keys(self):
+        """
+        Returns the names of the group members.
+        """
+        return list(self)
+
+    def get(self, name, default=None):
+        """
+        Returns the member with the given name, or the default if it does
+        not exist.
+        """
+        if name in self:
+            return self[name]
+        return default
+
+    def _check_new(self, name):
+        path = self._child_path(name)
+        if self._store.is_group(path) or self._store.is_array(path):
+            raise ValueError(f"Name '{name}' already exists in group '{self.name}'.")
+        return path
+
+    def create_group(self, name, **kwargs):  # pylint: disable=unused-argument
+        """
+        Creates a sub-group. HDF5-specific keyword arguments are ignored.
+        """
+        path = self._check_new(name)
+        self._store.create_group(path)
+        return StoreGroup(self._store, path)
+
+    def require_group(self, name):
+        """
+        Returns the sub-group with the given name, creating it if needed.
+        """
+        if name in self:
+            return self[name]
+        return self.create_group(name)
+
+    def create_dataset(
+        self, name, shape=None, dtype=None, data=None, **kwargs
+    ):  # pylint: disable=unused-argument
+        """
+        Creates a dataset, from the given data or filled with zeros.
+        HDF5-specific keyword arguments like ``chunks`` or ``compression`` are
+        ignored.
+        """
+        path = self._check_new(name)
+        if data is None:
+            self._store.create_array(
+                path, shape=shape, dtype=_to_numpy_dtype(np.dtype(dtype))
+            )
+        else:
+            data = _to_array(data, dtype)
+            if shape is not None:
+                data = data.reshape(shape)
+            self._store.create_array(path, data=data)
+        return StoreDataset(self._store, path)
+
+    def visit(self, func):
+        """
+        Calls ``func`` with the relative name of each member, recursively,
+        until it returns a value other than ``None``.
+        """
+        return self.visititems(lambda name, obj: func(name))
+
+    def visititems(self, func):
+        """
+        Calls ``func`` with the relative name and object of each member,
+        recursively, until it returns a value other than ``None``.
+        """
+        stack = [("", self)]
+        while stack:
+            prefix, group = stack.pop()
+            for name in reversed(list(group)):
+                obj = group[name]
+                res = func(prefix + name, obj)
+                if res is not None:
+                    return res
+                if isinstance(obj, StoreGroup):
+                    stack.append((prefix + name + "/", obj))
+        return None
+
+
+class StoreDataset(_StoreObject):
+    """
+    Dataset of a :class:`Store`, with a h5py-like interface.
+    """
+
+    @property
+    def shape(self):
+        """
+        The shape of the dataset.
+        """
+        return tuple(self._store.array_info(self._path)[0])
+
+    @property
+    def dtype(self):
+        """
+        The dtype of the dataset. Unicode arrays have the h5py string dtype.
+        """
+        dtype = np.dtype(self._store.array_info(self._path)[1])
+        if dtype.kind == "U":
+            return h5py.string_dtype()
+        return dtype
+
+    @property
+    def ndim(self):
+        """
+        The number of dimensions of the dataset.
+        """
+        return len(self.shape)
+
+    @property
+    def size(self):
+        """
+        The number of elements of the dataset.
+        """
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, selection):
+        return self._store.read(self._path, selection)
+
+    def __setitem__(self, selection, value):
+        self._store.write(self._path, selection, value)
+
+    def asstr(self):
+        """
+        Returns a wrapper which reads the dataset as Python strings.
+        """
+        return _AsStrWrapper(self)
+
+    def read_direct(self, dest, source_sel=None, dest_sel=None):
+        """
+        Reads the dataset into the given array.
+        """
+        if source_sel is None:
+            source_sel = ()
+        if dest_sel is None:
+            dest_sel = ()
+        dest[dest_sel] = self[source_sel]
+
+
+class _AsStrWrapper:
+    """
+    Wrapper which reads a string dataset as Python strings.
+    """
+
+    def __init__(self, dataset):
+        self._dataset = dataset
+
+    def __getitem__(self, selection):
+        res = self._dataset[selection]
+        if isinstance(res, np.ndarray):
+            return res.astype(object)
+        return str(res)
+
+
+class StoreAttributes:
+    """
+    Attributes of a group or dataset in a :class:`Store`.
+    """
+
+    def __init__(self, store, path):
+        self._store = store
+        self._path = path
+
+    def __getitem__(self, name):
+        return self._store.get_attrs(self._path)[name]
+
+    def __setitem__(self, name, value):
+        self._store.set_attr(self._path, name, value)
+
+    def __delitem__(self, name):
+        self._store.delete_attr(self._path, name)
+
+    def __contains__(self, name):
+        return name in self._store.get_attrs(self._path)
+
+    def __iter__(self):
+        return iter(list(self._store.get_attrs(self._path)))
+
+    def __len__(self):
+        return len(self._store.get_attrs(self._path))
+
+    def keys(self):
+        """
+        Returns the attribute names.
+        """
+        return list(self)
+
+    def items(self):
+        """
+        Returns the attribute names and values.
+        """
+        return list(self._store.get_attrs(self._path).items())
+
+    def get(self, name, default=None):
+        """
+        Returns the attribute with the given name, or the default if it does
+        not exist.
+        """
+        return self._store.get_attrs(self._path).get(name, default)
+
+
+def _to_numpy_dtype(dtype):
+    """
+    Converts the h5py string dtype to a numpy unicode dtype.
+    """
+    if h5py.check_string_dtype(dtype) is not None:
+        return np.dtype(str)
+    return dtype
+
+
+def _to_array(data, dtype=None):
+    """
+    Converts data to a numpy array which can be stored natively, raising a
+    TypeError otherwise.
+    """
+    if dtype is not None and h5py.check_string_dtype(np.dtype(dtype)) is not None:
+        dtype = str
+    try:
+        res = np.asarray(data, dtype=dtype)
+    except ValueError as exc:
+        raise TypeError(f"Cannot convert '{data}' to an array.") from exc
+    if res.dtype.hasobject:
+        raise TypeError(f"Object dtype {res.dtype} has no native equivalent.")
+    return res
+
+
+def _encode_attr(value):
+    """
+    Encodes an attribute value in a JSON-compatible form.
+    """
+    value = np.asarray(value)
+    if value.ndim != 0:
+        raise TypeError("Only scalar attributes are supported.")
+    if value.dtype.kind == "U":
+        return {"dtype": "str", "value": str(value)}
+    if value.dtype.kind in "SV":
+        return {
+            "dtype": value.dtype.str,
+            "value": base64.b64encode(value.tobytes()).decode("ascii"),
+        }
+    if value.dtype.kind == "c":
+        return {
+            "dtype": value.dtype.str,
+            "value": [value.real.item(), value.imag.item()],
+        }
+    if value.dtype.kind in "biuf":
+        return {"dtype": value.dtype.str, "value": value.item()}
+    raise TypeError(f"Attributes of dtype {value.dtype} are not supported.")
+
+
+def _decode_attr(encoded):
+    """
+    Decodes an attribute value encoded with :func:`_encode_attr`.
+    """
+    dtype, value = encoded["dtype"], encoded["value"]
+    if dtype == "str":
+        return value
+    dtype = np.dtype(dtype)
+    if dtype.kind == "V":
+        return np.void(base64.b64decode(value))
+    if dtype.kind == "S":
+        return np.bytes_(base64.b64decode(value))
+    if dtype.kind == "c":
+        return np.array(complex(*value), dtype=dtype)[()]
+    return np.array(value, dtype=dtype)[()]
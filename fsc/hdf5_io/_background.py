@@ -0,0 +1,131 @@
+"""
+Defines a function to save objects in a background thread or process.
+"""
+
+import copy
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import singledispatch
+
+import numpy as np
+
+from fsc.export import export
+
+from ._save_load import to_hdf5_file
+from ._simple_mapping import SimpleHDF5Mapping
+
+__all__ = []
+
+_DEFAULT_EXECUTOR = None
+_DEFAULT_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_default_executor():
+    """
+    Returns the executor used when none is given explicitly. It has a
+    single worker thread, such that checkpoints are written in order.
+    """
+    global _DEFAULT_EXECUTOR  # pylint: disable=global-statement
+    with _DEFAULT_EXECUTOR_LOCK:
+        if _DEFAULT_EXECUTOR is None:
+            _DEFAULT_EXECUTOR = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="fsc.hdf5_io.save"
+            )
+        return _DEFAULT_EXECUTOR
+
+
+@export
+def save_in_background(
+    obj, hdf5_file, *, atomic=True, copy_arrays=True, executor=None, **options
+):
+    """
+    Saves the object to a file in HDF5 format, in the background.
+
+    Before returning, a snapshot of the object is taken: containers
+    (lists, tuples, dicts and sets) are copied structurally, numpy arrays are
+    copied, and the attributes of :class:`.SimpleHDF5Mapping` instances are
+    snapshotted the same way. Other objects are not copied, and must not be
+    modified until the returned future is done.
+
+    :param obj: The object to be saved.
+
+    :param hdf5_file: Path of the file.
+    :type hdf5_file: str
+
+    :param atomic: Write to a temporary file which is renamed to ``hdf5_file`` on completion.
+    :type atomic: bool
+
+    :param copy_arrays: If set, numpy arrays are copied. Otherwise, a read-only view is taken, and the original array must not be modified until the returned future is done.
+    :type copy_arrays: bool
+
+    :param executor: Executor on which the object is written. By default, a single background thread is used. When passing a :py:class:`concurrent.futures.ProcessPoolExecutor`, the snapshot must be picklable.
+    :type executor: concurrent.futures.Executor
+
+    Additional keyword arguments are save options, see :func:`.to_hdf5`.
+
+    :returns: A future which is done when the file is written, and whose result is ``hdf5_file``.
+    :rtype: concurrent.futures.Future
+    """
+    if executor is None:
+        executor = _get_default_executor()
+    snapshot = _snapshot(obj, copy_arrays)
+    return executor.submit(_save_snapshot, snapshot, hdf5_file, atomic, options)
+
+
+def _save_snapshot(snapshot, hdf5_file, atomic, options):
+    to_hdf5_file(snapshot, hdf5_file, atomic=atomic, **options)
+    return hdf5_file
+
+
+def _snapshot(obj, copy_arrays):
+    """
+    Returns a copy of the object in which all containers and numpy arrays
+    are independent of the original.
+    """
+    if hasattr(obj, "to_hdf5") and not isinstance(obj, SimpleHDF5Mapping):
+        return obj
+    return _snapshot_singledispatch(obj, copy_arrays)
+
+
+@singledispatch
+def _snapshot_singledispatch(obj, copy_arrays):  # pylint: disable=unused-argument
+    return obj
+
+
+@_snapshot_singledispatch.register(np.ndarray)
+def _(obj, copy_arrays):
+    if copy_arrays:
+        return obj.copy()
+    res = obj.view()
+    res.flags.writeable = False
+    return res
+
+
+@_snapshot_singledispatch.register(list)
+def _(obj, copy_arrays):
+    return [_snapshot(part, copy_arrays) for part in obj]
+
+
+@_snapshot_singledispatch.register(tuple)
+def _(obj, copy_arrays):
+    return tuple(_snapshot(part, copy_arrays) for part in obj)
+
+
+@_snapshot_singledispatch.register(set)
+def _(obj, copy_arrays):  # pylint: disable=unused-argument
+    return set(obj)
+
+
+@_snapshot_singledispatch.register(Mapping)
+def _(obj, copy_arrays):
+    return {key: _snapshot(value, copy_arrays) for key, value in obj.items()}
+
+
+@_snapshot_singledispatch.register(SimpleHDF5Mapping)
+def _(obj, copy_arrays):
+    res = copy.copy(obj)
+    for key in list(obj.HDF5_ATTRIBUTES) + list(obj.HDF5_OPTIONAL):
+        if hasattr(obj, key):
+            setattr(res, key, _snapshot(getattr(obj, key), copy_arrays))
+    return res
@@ -0,0 +1,257 @@
+"""
+Defines the command line interface, available as ``python -m fsc.hdf5_io``
+or ``fsc-hdf5-io``.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import importlib
+import os
+import sys
+
+import h5py
+
+from ._save_load import from_hdf5_file, to_hdf5_file
+from ._special_types import _COMPACT_TAG_PREFIX
+from ._subscribe import TYPE_TAG_KEY
+from ._utils import decode_if_needed
+
+__all__ = ()
+
+
+def main(argv=None):
+    """
+    Runs the command line interface with the given arguments.
+    """
+    parser = _get_parser()
+    args = parser.parse_args(argv)
+    for module_name in args.imports:
+        importlib.import_module(module_name)
+    return args.func(args)
+
+
+def _get_parser():
+    parser = argparse.ArgumentParser(
+        prog="fsc-hdf5-io",
+        description="Inspect and convert files created by fsc.hdf5_io.",
+    )
+    parser.add_argument(
+        "--import",
+        dest="imports",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="Import a module which defines serializable classes (repeatable).",
+    )
+    subparsers = parser.add_subparsers(required=True, dest="command")
+
+    inspect_parser = subparsers.add_parser(
+        "inspect", help="Print the object tree without deserializing it."
+    )
+    inspect_parser.add_argument("file")
+    inspect_parser.add_argument(
+        "--max-depth", type=int, default=None, help="Maximum depth to print."
+    )
+    inspect_parser.set_defaults(func=_inspect)
+
+    stats_parser = subparsers.add_parser(
+        "stats", help="Report object counts and space usage."
+    )
+    stats_parser.add_argument("files", nargs="+")
+    stats_parser.set_defaults(func=_stats)
+
+    repack_parser = subparsers.add_parser(
+        "repack", help="Rewrite files in the most compact encoding."
+    )
+    repack_parser.add_argument("files", nargs="+")
+    repack_parser.add_argument(
+        "-o",
+        "--output-dir",
+        default=None,
+        help="Directory of the repacked files. By default, the files are replaced atomically.",
+    )
+    repack_parser.add_argument(
+        "--compression", default=None, help="Compression filter, e.g. gzip or lzf."
+    )
+    repack_parser.add_argument(
+        "--compression-opts",
+        type=int,
+        default=None,
+        help="Options of the compression filter, e.g. the gzip level.",
+    )
+    repack_parser.add_argument(
+        "--no-compact",
+        dest="compact",
+        action="store_false",
+        help="Do not store small values as attributes.",
+    )
+    repack_parser.add_argument(
+        "--profile", default=None, help="Profile of HDF5 file settings."
+    )
+    repack_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes.",
+    )
+    repack_parser.set_defaults(func=_repack)
+    return parser
+
+
+def _get_type_tag(group):
+    """
+    Returns the type tag of a group, or None if it has no type tag.
+    """
+    tag = group.get(TYPE_TAG_KEY, None)
+    if not isinstance(tag, h5py.Dataset):
+        return None
+    return decode_if_needed(tag[()])
+
+
+def _format_dataset(dataset):
+    return f"{dataset.dtype} {dataset.shape}, {dataset.id.get_storage_size()} bytes"
+
+
+def _inspect(args):
+    with h5py.File(args.file, "r") as hdf5_file:
+        stack = [("/", hdf5_file, 0)]
+        while stack:
+            name, obj, depth = stack.pop()
+            indent = "  " * depth
+            if isinstance(obj, h5py.Dataset):
+                print(f"{indent}{name}: {_format_dataset(obj)}")
+                continue
+            print(f"{indent}{name} <{_get_type_tag(obj)}>")
+            if args.max_depth is not None and depth >= args.max_depth:
+                continue
+            for attr_name, tag in _get_compact_items(obj):
+                print(f"{indent}  {attr_name} <{tag}> (attribute)")
+            children = [
+                (key, obj[key], depth + 1) for key in obj if key != TYPE_TAG_KEY
+            ]
+            stack.extend(reversed(children))
+    return 0
+
+
+def _get_compact_items(group):
+    """
+    Returns the names and type tags of the values stored as attributes.
+    """
+    return [
+        (key[len(_COMPACT_TAG_PREFIX) :], decode_if_needed(value))
+        for key, value in group.attrs.items()
+        if key.startswith(_COMPACT_TAG_PREFIX)
+    ]
+
+
+def _get_stats(file_name):
+    """
+    Returns the object counts and space usage of a file.
+    """
+    type_tags = collections.Counter()
+    counts = collections.Counter()
+    raw_bytes = 0
+
+    def visit(obj):
+        nonlocal raw_bytes
+        counts["attributes"] += len(obj.attrs)
+        if isinstance(obj, h5py.Dataset):
+            counts["datasets"] += 1
+            raw_bytes += obj.id.get_storage_size()
+            return
+        counts["groups"] += 1
+        tag = _get_type_tag(obj)
+        if tag is not None:
+            type_tags[tag] += 1
+        for _, tag in _get_compact_items(obj):
+            type_tags[tag] += 1
+
+    with h5py.File(file_name, "r") as hdf5_file:
+        visit(hdf5_file)
+        hdf5_file.visititems(lambda name, obj: visit(obj))
+        free_bytes = hdf5_file.id.get_freespace()
+    file_bytes = os.path.getsize(file_name)
+    return {
+        "type_tags": type_tags,
+        "counts": counts,
+        "file_bytes": file_bytes,
+        "raw_bytes": raw_bytes,
+        "metadata_bytes": file_bytes - raw_bytes - free_bytes,
+        "free_bytes": free_bytes,
+    }
+
+
+def _stats(args):
+    for file_name in args.files:
+        stats = _get_stats(file_name)
+        print(f"{file_name}:")
+        for key in ["groups", "datasets", "attributes"]:
+            print(f"  {key + ':':<16}{stats['counts'][key]}")
+        for key in ["file_bytes", "raw_bytes", "metadata_bytes", "free_bytes"]:
+            label = key.replace("_", " ") + ":"
+            print(f"  {label:<16}{stats[key]}")
+        print("  objects by type tag:")
+        for tag, count in sorted(
+            stats["type_tags"].items(), key=lambda item: (-item[1], item[0])
+        ):
+            print(f"    {tag:<30}{count}")
+    return 0
+
+
+def _repack_file(source, target, imports, options):
+    """
+    Loads a file, and saves it to the target file with the given options.
+    """
+    for module_name in imports:
+        importlib.import_module(module_name)
+    source_size = os.path.getsize(source)
+    obj = from_hdf5_file(source)
+    to_hdf5_file(obj, target, atomic=True, **options)
+    return source_size, os.path.getsize(target)
+
+
+def _repack(args):
+    options = {
+        "profile": args.profile,
+        "compact": args.compact,
+        "compression": args.compression,
+        "compression_opts": args.compression_opts,
+    }
+    if args.output_dir is None:
+        targets = args.files
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+        targets = [
+            os.path.join(args.output_dir, os.path.basename(file_name))
+            for file_name in args.files
+        ]
+    tasks = [
+        (source, target, args.imports, options)
+        for source, target in zip(args.files, targets)
+    ]
+    if args.jobs == 1:
+        results = [_try_repack(*task) for task in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(args.jobs) as executor:
+            results = list(executor.map(_try_repack, *zip(*tasks)))
+
+    exit_code = 0
+    for source, (sizes, error) in zip(args.files, results):
+        if error is not None:
+            print(f"{source}: failed ({error})", file=sys.stderr)
+            exit_code = 1
+        else:
+            print(f"{source}: {sizes[0]} -> {sizes[1]} bytes")
+    return exit_code
+
+
+def _try_repack(source, target, imports, options):
+    """
+    Repacks a file, returning the error message instead of raising.
+    """
+    try:
+        return _repack_file(source, target, imports, options), None
+    except Exception as exc:  # pylint: disable=broad-except
+        return None, f"{type(exc).__name__}: {exc}"
@@ -0,0 +1,69 @@
+"""
+Defines named profiles of HDF5 file settings, used when opening files in
+:func:`.to_hdf5_file` and :func:`.from_hdf5_file`.
+"""
+
+import types
+
+__all__ = ()
+
+_FILE_PROFILES = types.MappingProxyType(
+    {
+        "default": types.MappingProxyType({}),
+        # Trees of many small groups and datasets, as created for nested
+        # containers: the metadata is aggregated into file-space pages,
+        # which are cached by the page buffer.
+        "many-small-objects": types.MappingProxyType(
+            {
+                "libver": "latest",
+                "fs_strategy": "page",
+                "fs_page_size": 4096,
+                "page_buf_size": 4 * 2**20,
+                "meta_block_size": 64 * 2**10,
+            }
+        ),
+        # Few large (chunked) arrays: a large chunk cache, and alignment of
+        # the raw data to file-system blocks.
+        "few-large-arrays": types.MappingProxyType(
+            {
+                "rdcc_nbytes": 64 * 2**20,
+                "rdcc_nslots": 100003,
+                "alignment_threshold": 2**20,
+                "alignment_interval": 2**20,
+            }
+        ),
+    }
+)
+
+# Settings which only apply when a file is created.
+_CREATE_ONLY_OPTIONS = frozenset(
+    ["fs_strategy", "fs_persist", "fs_threshold", "fs_page_size", "userblock_size"]
+)
+
+
+def get_file_kwargs(*, mode, profile=None, file_options=None):
+    """
+    Returns the keyword arguments to open a :py:class:`h5py.File<File>`
+    with the given profile and raw overrides.
+
+    :param mode: The mode in which the file is opened.
+    :type mode: str
+
+    :param profile: Name of the profile: ``'default'``, ``'many-small-objects'`` or ``'few-large-arrays'``.
+    :type profile: str
+
+    :param file_options: Keyword arguments for :py:class:`h5py.File<File>`, which take precedence over the profile.
+    :type file_options: dict
+    """
+    try:
+        res = dict(_FILE_PROFILES[profile or "default"])
+    except KeyError as err:
+        raise ValueError(
+            f"Unknown file profile '{profile}', must be one of {sorted(_FILE_PROFILES)}."
+        ) from err
+    if mode == "r":
+        res = {
+            key: value for key, value in res.items() if key not in _CREATE_ONLY_OPTIONS
+        }
+    res.update(file_options or {})
+    return res
@@ -0,0 +1,200 @@
+"""
+Defines a cache of load plans, which speeds up loading many files with the
+same structure.
+"""
+
+import collections
+
+import h5py
+
+from fsc.export import export
+
+from ._save_load import _get_deserializer, from_hdf5
+from ._special_types import (
+    _DictDeserializer,
+    _ensure_hashable,
+    _ListDeserializer,
+    _NoneDeserializer,
+    _NumpyArraryDeserializer,
+    _StringDeserializer,
+    _TupleDeserializer,
+    _ValueDeserializer,
+)
+from ._subscribe import TYPE_TAG_KEY
+from ._utils import decode_if_needed
+
+__all__ = []
+
+# Instructions of a load plan. The plan is a flat list of (opcode, argument)
+# pairs in post-order, which push loaded values onto a stack or combine the
+# values on top of the stack into containers.
+_PUSH_VALUE = 0  # argument: path of the dataset
+_PUSH_STR = 1  # argument: path of the dataset
+_PUSH_NONE = 2
+_PUSH_GENERIC = 3  # argument: path of the group, loaded with from_hdf5
+_BUILD_LIST = 4  # argument: number of elements
+_BUILD_TUPLE = 5  # argument: number of elements
+_BUILD_DICT = 6
+
+# Objects are accessed by their path from the loaded group, which takes time
+# proportional to the depth. Deeper objects are therefore loaded with
+# from_hdf5 instead.
+_MAX_PLAN_DEPTH = 32
+
+
+@export
+class LoadPlanCache:
+    """
+    Cache of load plans for files which share the same structure.
+
+    The first time a structure is loaded, the type tags of all objects are
+    read, and a plan of how to load the built-in types is created. The plan
+    is stored under a fingerprint of the structure, namely the names of all
+    groups and datasets and their number of attributes. Further objects with
+    the same fingerprint are loaded by executing the plan, which reads only
+    the values and skips reading the type tags and listing the groups.
+
+    Objects with the same structure are assumed to have the same types.
+    This holds for files written by the same code, but for example a list
+    and a tuple with the same elements have the same structure. Custom
+    classes and types other than the built-in containers, numbers,
+    strings, bytes, ``None`` and plain numpy arrays are loaded with
+    :func:`.from_hdf5`.
+
+    :param maxsize: Maximum number of plans which are kept.
+    :type maxsize: int
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans = collections.OrderedDict()
+
+    def from_hdf5(self, hdf5_handle, **kwargs):
+        """
+        Deserializes the given HDF5 handle into an object, using the cached
+        plan for its structure if possible.
+
+        :param hdf5_handle: HDF5 location where the serialized object is stored.
+        :type hdf5_handle: :py:class:`h5py.File<File>` or :py:class:`h5py.Group<Group>`.
+
+        Additional keyword arguments are passed to :func:`.from_hdf5`, in
+        which case no plan is used.
+        """
+        if kwargs or not isinstance(hdf5_handle, h5py.Group):
+            return from_hdf5(hdf5_handle, **kwargs)
+        structure = _get_structure(hdf5_handle)
+        fingerprint = tuple(structure)
+        try:
+            plan = self._plans[fingerprint]
+            self._plans.move_to_end(fingerprint)
+            self.hits += 1
+        except KeyError:
+            plan = _build_plan(hdf5_handle, structure)
+            self._plans[fingerprint] = plan
+            if len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+            self.misses += 1
+        return _execute_plan(plan, hdf5_handle)
+
+    def clear(self):
+        """
+        Removes all plans from the cache.
+        """
+        self._plans.clear()
+
+
+def _get_structure(hdf5_handle):
+    """
+    Returns the names, object types and number of attributes of all objects
+    below (and including) the given group, in a single traversal.
+    """
+    res = [("", h5py.h5o.TYPE_GROUP, h5py.h5o.get_info(hdf5_handle.id).num_attrs)]
+    h5py.h5o.visit(
+        hdf5_handle.id,
+        lambda name, info: res.append(
+            (name.decode("utf-8"), info.type, info.num_attrs)
+        ),
+        info=True,
+    )
+    return res
+
+
+def _build_plan(hdf5_handle, structure):
+    """
+    Creates the load plan for the object stored at the given handle.
+    """
+    num_attrs = {name: attrs for name, _, attrs in structure}
+    members = collections.defaultdict(list)
+    for name, _, _ in structure[1:]:
+        parent, _, member = name.rpartition("/")
+        members[parent].append(member)
+
+    def join(path, name):
+        return f"{path}/{name}" if path else name
+
+    plan = []
+    # Stack of (path, depth, instruction) tuples, where a pending instruction
+    # is added to the plan once the children of the node have been planned.
+    stack = [("", 0, None)]
+    while stack:
+        path, depth, instruction = stack.pop()
+        if instruction is not None:
+            plan.append(instruction)
+            continue
+        node_members = members[path]
+        group = hdf5_handle[path] if path else hdf5_handle
+        if TYPE_TAG_KEY not in node_members or depth > _MAX_PLAN_DEPTH:
+            plan.append((_PUSH_GENERIC, path))
+            continue
+        obj_class = _get_deserializer(group)
+        if obj_class is _NoneDeserializer:
+            plan.append((_PUSH_NONE, None))
+        elif obj_class is _ValueDeserializer or (
+            obj_class is _NumpyArraryDeserializer
+            and sorted(node_members) == [TYPE_TAG_KEY, "value"]
+            and num_attrs[join(path, "value")] == 0
+        ):
+            plan.append((_PUSH_VALUE, join(path, "value")))
+        elif obj_class is _StringDeserializer:
+            plan.append((_PUSH_STR, join(path, "value")))
+        elif num_attrs[path] != 0:
+            # values stored as attributes in compact mode
+            plan.append((_PUSH_GENERIC, path))
+        elif obj_class in (_ListDeserializer, _TupleDeserializer):
+            keys = sorted((key for key in node_members if key != TYPE_TAG_KEY), key=int)
+            opcode = _BUILD_LIST if obj_class is _ListDeserializer else _BUILD_TUPLE
+            stack.append((path, depth, (opcode, len(keys))))
+            stack.extend((join(path, key), depth + 1, None) for key in reversed(keys))
+        elif obj_class is _DictDeserializer and "items" in node_members:
+            stack.append((path, depth, (_BUILD_DICT, None)))
+            stack.append((join(path, "items"), depth + 1, None))
+        else:
+            plan.append((_PUSH_GENERIC, path))
+    return plan
+
+
+def _execute_plan(plan, hdf5_handle):
+    """
+    Loads the object stored at the given handle by executing a load plan.
+    """
+    stack = []
+    for opcode, argument in plan:
+        if opcode == _PUSH_VALUE:
+            stack.append(hdf5_handle[argument][()])
+        elif opcode == _PUSH_STR:
+            stack.append(decode_if_needed(hdf5_handle[argument][()]))
+        elif opcode == _PUSH_NONE:
+            stack.append(None)
+        elif opcode == _PUSH_GENERIC:
+            stack.append(from_hdf5(hdf5_handle[argument] if argument else hdf5_handle))
+        elif opcode == _BUILD_DICT:
+            stack.append({_ensure_hashable(k): v for k, v in stack.pop()})
+        else:
+            start = len(stack) - argument
+            values = stack[start:]
+            del stack[start:]
+            stack.append(values if opcode == _BUILD_LIST else tuple(values))
+    (res,) = stack
+    return res
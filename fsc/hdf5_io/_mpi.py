@@ -0,0 +1,100 @@
+"""
+Defines the (de-)serialization of numpy arrays which are distributed across
+MPI ranks.
+"""
+
+import numpy as np
+
+from fsc.export import export
+
+from ._special_types import (
+    _DISTRIBUTED_AXIS_KEY,
+    _SpecialTypeTags,
+    add_type_tag,
+    to_hdf5_singledispatch,
+)
+
+__all__ = []
+
+
+@export
+class DistributedArray:
+    """
+    Numpy array which is distributed across the ranks of an MPI communicator,
+    in contiguous blocks along one axis. Each rank holds its block in
+    ``local_array``. Creating the object is a collective operation.
+
+    Distributed arrays are saved as a single dataset, to which each rank
+    writes its block collectively. When the file is opened with the ``mpio``
+    driver (see the ``comm`` parameter of :func:`.from_hdf5_file`), they are
+    loaded as :class:`DistributedArray` again, with the blocks evenly split
+    across the ranks. Otherwise, they are loaded as regular numpy arrays.
+
+    :param local_array: The block of the array held by the current rank.
+    :type local_array: numpy.ndarray
+
+    :param comm: The MPI communicator across which the array is distributed.
+    :type comm: mpi4py.MPI.Comm
+
+    :param axis: The axis along which the array is distributed.
+    :type axis: int
+    """
+
+    def __init__(self, local_array, comm, axis=0):
+        self.local_array = np.asarray(local_array)
+        self.comm = comm
+        self.axis = axis
+        local_shapes = comm.allgather(self.local_array.shape)
+        other_dims = {shape[:axis] + shape[axis + 1 :] for shape in local_shapes}
+        if len(other_dims) != 1:
+            raise ValueError(
+                f"The local arrays must have the same shape along all axes except {axis}, got shapes {local_shapes}."
+            )
+        sizes = [shape[axis] for shape in local_shapes]
+        self.offset = sum(sizes[: comm.rank])
+        global_shape = list(self.local_array.shape)
+        global_shape[axis] = sum(sizes)
+        self.global_shape = tuple(global_shape)
+
+    @property
+    def local_selection(self):
+        """
+        The selection of the global array held by the current rank.
+        """
+        selection = [slice(None)] * len(self.global_shape)
+        selection[self.axis] = slice(
+            self.offset, self.offset + self.local_array.shape[self.axis]
+        )
+        return tuple(selection)
+
+
+@to_hdf5_singledispatch.register(DistributedArray)
+@add_type_tag(_SpecialTypeTags.NUMPY_ARRAY)
+def _(obj, hdf5_handle):
+    dataset = hdf5_handle.create_dataset(
+        "value", shape=obj.global_shape, dtype=obj.local_array.dtype
+    )
+    hdf5_handle[_DISTRIBUTED_AXIS_KEY] = obj.axis
+    if hdf5_handle.file.driver == "mpio":
+        with dataset.collective:
+            dataset[obj.local_selection] = obj.local_array
+    else:
+        dataset[obj.local_selection] = obj.local_array
+
+
+def load_distributed_array(hdf5_handle):
+    """
+    Loads the block of a distributed array belonging to the current rank,
+    from a file opened with the ``mpio`` driver.
+    """
+    comm, _ = hdf5_handle.file.id.get_access_plist().get_fapl_mpio()
+    axis = int(hdf5_handle[_DISTRIBUTED_AXIS_KEY][()])
+    dataset = hdf5_handle["value"]
+    num_blocks, remainder = divmod(dataset.shape[axis], comm.size)
+    start = comm.rank * num_blocks + min(comm.rank, remainder)
+    stop = start + num_blocks + (1 if comm.rank < remainder else 0)
+    selection = [slice(None)] * dataset.ndim
+    selection[axis] = slice(start, stop)
+    with dataset.collective:
+        local_array = dataset[tuple(selection)]
+    return DistributedArray(local_array, comm=comm, axis=axis)
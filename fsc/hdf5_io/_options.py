@@ -0,0 +1,48 @@
+"""
+Defines the options which control how objects are serialized.
+"""
+
+import contextlib
+import contextvars
+
+__all__ = ()
+
+# Default values of all save options. The documentation of each option is
+# given in :func:`to_hdf5`.
+_DEFAULT_SAVE_OPTIONS = {
+    "compact": False,
+    "compression": None,
+    "compression_opts": None,
+    "block_size": 64 * 2**20,
+    "precision": None,
+}
+
+_SAVE_OPTIONS = contextvars.ContextVar(
+    "fsc.hdf5_io.save_options", default=_DEFAULT_SAVE_OPTIONS
+)
+
+
+def get_save_option(name):
+    """
+    Returns the value of a save option in the current context.
+
+    :param name: Name of the option.
+    :type name: str
+    """
+    return _SAVE_OPTIONS.get()[name]
+
+
+@contextlib.contextmanager
+def save_options(**options):
+    """
+    Context manager which updates the save options within its context. Options
+    which are not given keep their current value.
+    """
+    unknown_options = set(options) - set(_DEFAULT_SAVE_OPTIONS)
+    if unknown_options:
+        raise TypeError(f"Unknown save options {sorted(unknown_options)}.")
+    token = _SAVE_OPTIONS.set({**_SAVE_OPTIONS.get(), **options})
+    try:
+        yield
+    finally:
+        _SAVE_OPTIONS.reset(token)
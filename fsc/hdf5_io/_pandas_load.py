@@ -0,0 +1,133 @@
+"""
+Module defining the deserialization method for pandas objects.
+"""
+
+import numpy as np
+
+from ._save_load import from_hdf5
+from ._special_types import Deserializable, _SpecialTypeTags
+from ._subscribe import subscribe_hdf5
+from ._utils import decode_if_needed
+
+
+@subscribe_hdf5(_SpecialTypeTags.PANDAS_DATAFRAME)
+class _DataFrameDeserializer(Deserializable):
+    """Helper class to de-serialize pandas DataFrames."""
+
+    @classmethod
+    def from_hdf5(cls, hdf5_handle, columns=None):
+        """
+        Loads the DataFrame, or only the given columns of it.
+
+        :param columns: Labels of the columns to load. By default, all columns are loaded.
+        :type columns: list
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        index = _deserialize_index(hdf5_handle["index"])
+        labels = _deserialize_index(hdf5_handle["columns"])
+        if columns is None:
+            positions = range(len(labels))
+        else:
+            positions = labels.get_indexer_for(columns)
+            if (positions < 0).any():
+                missing = [col for col, pos in zip(columns, positions) if pos < 0]
+                raise KeyError(f"Columns {missing} not found.")
+        data_group = hdf5_handle["data"]
+        res = pd.DataFrame(
+            {
+                i: _to_series(
+                    _deserialize_column(data_group[str(position)]), index=index
+                )
+                for i, position in enumerate(positions)
+            },
+            index=index,
+        )
+        res.columns = labels[list(positions)]
+        return res
+
+
+@subscribe_hdf5(_SpecialTypeTags.PANDAS_SERIES)
+class _SeriesDeserializer(Deserializable):
+    """Helper class to de-serialize pandas Series."""
+
+    @classmethod
+    def from_hdf5(cls, hdf5_handle):
+        return _to_series(
+            _deserialize_column(hdf5_handle["values"]),
+            index=_deserialize_index(hdf5_handle["index"]),
+            name=from_hdf5(hdf5_handle["name"]),
+        )
+
+
+@subscribe_hdf5(_SpecialTypeTags.PANDAS_INDEX)
+class _IndexDeserializer(Deserializable):
+    """Helper class to de-serialize pandas Index objects."""
+
+    @classmethod
+    def from_hdf5(cls, hdf5_handle):
+        return _deserialize_index(hdf5_handle)
+
+
+def _to_series(values, **kwargs):
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    # The dtype is given explicitly, such that object arrays of strings are
+    # not inferred as string dtype.
+    return pd.Series(values, dtype=values.dtype, copy=False, **kwargs)
+
+
+def _deserialize_index(hdf5_handle):
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    kind = decode_if_needed(hdf5_handle["kind"][()])
+    names = from_hdf5(hdf5_handle["names"])
+    if kind == "range":
+        start, stop, step = (int(x) for x in hdf5_handle["range"][()])
+        return pd.RangeIndex(start, stop, step, name=names[0])
+    if kind == "multi":
+        levels_group = hdf5_handle["levels"]
+        return pd.MultiIndex.from_arrays(
+            [_deserialize_column(levels_group[str(i)]) for i in range(len(names))],
+            names=names,
+        )
+    values = _deserialize_column(hdf5_handle["values"])
+    return pd.Index(values, dtype=values.dtype, name=names[0])
+
+
+def _deserialize_column(hdf5_handle):
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    dtype = pd.api.types.pandas_dtype(decode_if_needed(hdf5_handle["dtype"][()]))
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(
+            _read_values(hdf5_handle, "codes"),
+            categories=_deserialize_column(hdf5_handle["categories"]),
+            ordered=bool(hdf5_handle["ordered"][()]),
+        )
+    values = _read_values(hdf5_handle)
+    if dtype.kind in "mM":
+        res = pd.array(values.view(dtype.base))
+        if getattr(dtype, "tz", None) is not None:
+            res = res.tz_localize("UTC").tz_convert(dtype.tz)
+        return res
+    if "mask" in hdf5_handle:
+        res = pd.array(values, dtype=dtype)
+        mask = _read_values(hdf5_handle, "mask")
+        if mask.any():
+            res[mask] = None
+        return res
+    return values
+
+
+def _read_values(hdf5_handle, name="values"):
+    value = hdf5_handle[name]
+    if hasattr(value, "dtype"):
+        return value[()]
+    res = from_hdf5(value)
+    if isinstance(res, list):
+        # mixed object arrays are stored as a list
+        elements = res
+        res = np.empty(len(elements), dtype=object)
+        res[:] = elements
+    return res
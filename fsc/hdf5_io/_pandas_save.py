@@ -0,0 +1,108 @@
+"""
+Module defining the serialization method for pandas objects.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ._save_load import to_hdf5
+from ._special_types import (
+    _PRIMITIVE_ARRAY_TYPES,
+    _compression_kwargs,
+    _SpecialTypeTags,
+    add_type_tag,
+    to_hdf5_singledispatch,
+)
+
+
+@to_hdf5_singledispatch.register(pd.DataFrame)
+@add_type_tag(_SpecialTypeTags.PANDAS_DATAFRAME)
+def _(obj, hdf5_handle):
+    _index_serializer(obj.index, hdf5_handle.create_group("index"))
+    _index_serializer(obj.columns, hdf5_handle.create_group("columns"))
+    data_group = hdf5_handle.create_group("data")
+    for i in range(obj.shape[1]):
+        _column_serializer(obj.iloc[:, i], data_group.create_group(str(i)))
+
+
+@to_hdf5_singledispatch.register(pd.Series)
+@add_type_tag(_SpecialTypeTags.PANDAS_SERIES)
+def _(obj, hdf5_handle):
+    _index_serializer(obj.index, hdf5_handle.create_group("index"))
+    _column_serializer(obj, hdf5_handle.create_group("values"))
+    to_hdf5(obj.name, hdf5_handle.create_group("name"))
+
+
+@to_hdf5_singledispatch.register(pd.Index)
+@add_type_tag(_SpecialTypeTags.PANDAS_INDEX)
+def _(obj, hdf5_handle):
+    _index_serializer(obj, hdf5_handle)
+
+
+def _index_serializer(index, hdf5_handle):
+    """
+    Stores a range index by its bounds, a multi-index by its levels, and
+    other indices as a single column.
+    """
+    if isinstance(index, pd.RangeIndex):
+        hdf5_handle["kind"] = "range"
+        hdf5_handle["range"] = np.array(
+            [index.start, index.stop, index.step], dtype=np.int64
+        )
+    elif isinstance(index, pd.MultiIndex):
+        hdf5_handle["kind"] = "multi"
+        levels_group = hdf5_handle.create_group("levels")
+        for i in range(index.nlevels):
+            _column_serializer(
+                index.get_level_values(i), levels_group.create_group(str(i))
+            )
+    else:
+        hdf5_handle["kind"] = "single"
+        _column_serializer(index, hdf5_handle.create_group("values"))
+    to_hdf5(list(index.names), hdf5_handle.create_group("names"))
+
+
+def _column_serializer(values, hdf5_handle):
+    """
+    Stores the values of a Series or Index, with their dtype, as typed
+    datasets. Categoricals are stored as codes and categories, and missing
+    values of extension arrays as a mask.
+    """
+    dtype = values.dtype
+    hdf5_handle["dtype"] = str(dtype)
+    if isinstance(dtype, pd.CategoricalDtype):
+        _write_values(np.asarray(values.array.codes), hdf5_handle, "codes")
+        _column_serializer(dtype.categories, hdf5_handle.create_group("categories"))
+        hdf5_handle["ordered"] = bool(dtype.ordered)
+    elif dtype.kind in "mM":
+        # Time zone aware values are stored in UTC.
+        _write_values(np.asarray(values.array.asi8), hdf5_handle)
+    elif isinstance(dtype, np.dtype):
+        _write_values(values.to_numpy(), hdf5_handle)
+    else:
+        _write_values(np.asarray(values.isna()), hdf5_handle, "mask")
+        if isinstance(dtype, pd.StringDtype):
+            data = values.to_numpy(dtype=object, na_value="")
+        elif hasattr(dtype, "numpy_dtype"):
+            data = values.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+        else:
+            data = values.to_numpy(dtype=object, na_value=None)
+        _write_values(data, hdf5_handle)
+
+
+def _write_values(data, hdf5_handle, name="values"):
+    """
+    Writes an array as a single dataset, or with the generic serialization
+    for object arrays. Object arrays with mixed element types are stored as
+    a list, which keeps the type of each element.
+    """
+    if data.dtype == object:
+        element_types = {type(x) for x in data}
+        if not (
+            element_types <= {str}
+            or (len(element_types) == 1 and element_types <= _PRIMITIVE_ARRAY_TYPES)
+        ):
+            data = data.tolist()
+        to_hdf5(data, hdf5_handle.create_group(name))
+    else:
+        hdf5_handle.create_dataset(name, data=data, **_compression_kwargs(data))
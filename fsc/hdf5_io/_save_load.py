@@ -2,12 +2,19 @@
 Defines free functions to serialize / deserialize bands-inspect objects to HDF5.
 """
 
+import contextlib
+import os
+import tempfile
+from collections.abc import Iterable, Mapping
 from functools import lru_cache, singledispatch
 
 import h5py
 
 from fsc.export import export
 
+from ._backends import Store, open_store
+from ._file_profiles import get_file_kwargs
+from ._options import save_options
 from ._subscribe import SERIALIZE_MAPPING, TYPE_TAG_KEY
 from ._utils import decode_if_needed
 
@@ -52,13 +59,10 @@ def _try_loading_parts(*, identifier, entry_point_mapping):
     return False
 
 
-@export
-def from_hdf5(hdf5_handle):
+def _get_deserializer(hdf5_handle):
     """
-    Deserializes the given HDF5 handle into an object.
-
-    :param hdf5_handle: HDF5 location where the serialized object is stored.
-    :type hdf5_handle: :py:class:`h5py.File<File>` or :py:class:`h5py.Group<Group>`.
+    Helper function to get the class which deserializes the object stored
+    at the given HDF5 handle, based on its type tag.
     """
     try:
         type_tag = decode_if_needed(hdf5_handle[TYPE_TAG_KEY][()])
@@ -67,7 +71,7 @@ def from_hdf5(hdf5_handle):
             f"HDF5 object '{hdf5_handle.name}' cannot be de-serialized: No type information given."
         ) from err
     try:
-        obj_class = SERIALIZE_MAPPING[type_tag]
+        return SERIALIZE_MAPPING[type_tag]
     except KeyError as err:
         partial_tag = _try_loading_parts(
             identifier=type_tag,
@@ -78,45 +82,173 @@ def from_hdf5(hdf5_handle):
                 f"Unknown {TYPE_TAG_KEY} '{type_tag}'. The module defining this class has not been imported, and no matching entry point was found."
             ) from err
         try:
-            obj_class = SERIALIZE_MAPPING[type_tag]
+            return SERIALIZE_MAPPING[type_tag]
         except KeyError as err2:
             raise KeyError(
                 f"Unknown {TYPE_TAG_KEY} '{type_tag}'. The module defining this class has not been imported, even after loading entry point {partial_tag}."
             ) from err2
-    return obj_class.from_hdf5(hdf5_handle)
 
 
 @export
-def to_hdf5(obj, hdf5_handle):
+def from_hdf5(hdf5_handle, **kwargs):
+    """
+    Deserializes the given HDF5 handle into an object.
+
+    Nested built-in types are deserialized with an explicit stack instead of
+    recursive calls, such that the nesting depth is not limited by the Python
+    recursion limit.
+
+    :param hdf5_handle: HDF5 location where the serialized object is stored.
+    :type hdf5_handle: :py:class:`h5py.File<File>` or :py:class:`h5py.Group<Group>`.
+
+    Additional keyword arguments are passed to the ``from_hdf5`` method of
+    the class which deserializes the object, for example ``columns`` to load
+    only some columns of a :py:class:`pandas.DataFrame`.
+    """
+    obj_class = _get_deserializer(hdf5_handle)
+    if kwargs or not hasattr(obj_class, "iter_from_hdf5"):
+        return obj_class.from_hdf5(hdf5_handle, **kwargs)
+    return _run_deserializer(obj_class.iter_from_hdf5(hdf5_handle))
+
+
+def _run_deserializer(deserializer):
+    """
+    Runs a generator-based deserializer until it returns the deserialized
+    object.
+
+    The generator yields the HDF5 handles of the child objects it needs, and
+    is sent the corresponding deserialized objects. Children whose class
+    also defines an ``iter_from_hdf5`` generator are handled on the same
+    explicit stack, all other classes are deserialized with their
+    ``from_hdf5`` method.
+
+    :param deserializer: The generator to run.
+    :type deserializer: generator
+    """
+    stack = [deserializer]
+    value = None
+    while stack:
+        try:
+            child_handle = stack[-1].send(value)
+        except StopIteration as exc:
+            stack.pop()
+            value = exc.value
+            continue
+        obj_class = _get_deserializer(child_handle)
+        if hasattr(obj_class, "iter_from_hdf5"):
+            stack.append(obj_class.iter_from_hdf5(child_handle))
+            value = None
+        else:
+            value = obj_class.from_hdf5(child_handle)
+    return value
+
+
+@export
+def to_hdf5(obj, hdf5_handle, **options):
     """
     Serializes a given object to HDF5 format.
 
+    Nested built-in types are serialized with an explicit stack instead of
+    recursive calls, such that the nesting depth is not limited by the Python
+    recursion limit.
+
     :param obj: Object to serialize.
 
     :param hdf5_handle: HDF5 location where the serialized object gets stored.
     :type hdf5_handle: :py:class:`h5py.File<File>` or :py:class:`h5py.Group<Group>`.
+
+    The following keyword-only options control how objects are stored. They
+    also apply to nested calls of ``to_hdf5``, for example from the
+    ``to_hdf5`` method of a contained object. Options which are not given
+    keep the value of the enclosing call.
+
+    :param compact: Store numbers, ``None``, and short strings and bytes which are elements of a list, tuple or dict as attributes of the parent group, instead of creating a group for each of them.
+    :type compact: bool
+
+    :param compression: Compression filter for array datasets, for example ``'gzip'`` or ``'lzf'``. Scalar and empty datasets are not compressed.
+    :type compression: str
+
+    :param compression_opts: Options of the compression filter, for example the ``'gzip'`` level.
+
+    :param block_size: Arrays which are larger than this number of bytes, or not C-contiguous, are written in blocks of at most this size. This bounds the memory used to save strided views and arrays which do not fit into memory, like large :py:class:`numpy.memmap` arrays or datasets of another HDF5 file. Defaults to 64 MiB.
+    :type block_size: int
+
+    :param precision: Lossy storage of floating-point arrays. A floating-point dtype like ``'float32'`` or ``'float16'`` stores the arrays with that dtype. ``('scaleoffset', n)`` uses the HDF5 scale-offset filter, keeping ``n`` decimal digits after the decimal point. ``('bitround', n)`` rounds the mantissas to ``n`` significant decimal digits, and compresses the arrays (with ``gzip`` unless ``compression`` is given). The original dtype is recorded and restored on load.
+    :type precision: str or tuple
+    """
+    with save_options(**options):
+        _to_hdf5_stack(obj, hdf5_handle)
+
+
+def _to_hdf5_stack(obj, hdf5_handle):
+    """
+    Serializes the object, handling nested built-in types with an explicit
+    stack.
+    """
+    children = _serialize_node(obj, hdf5_handle)
+    if children is None:
+        return
+    stack = [(hdf5_handle, iter(children))]
+    while stack:
+        parent_handle, children = stack[-1]
+        try:
+            child, name = next(children)
+        except StopIteration:
+            stack.pop()
+            continue
+        child_handle = parent_handle.create_group(name)
+        grandchildren = _serialize_node(child, child_handle)
+        if grandchildren is not None:
+            stack.append((child_handle, iter(grandchildren)))
+
+
+def _serialize_node(obj, hdf5_handle):
+    """
+    Serializes a single object, returning the (optional) iterable of
+    ``(child, name)`` pairs which still need to be serialized.
     """
     if hasattr(obj, "to_hdf5"):
         obj.to_hdf5(hdf5_handle)
-    else:
-        try:
-            to_hdf5_singledispatch(obj, hdf5_handle)
-        except SerializerNotFound as exc:
-            objtype = type(obj)
-            objmodule = objtype.__module__
-            if objmodule is None:
-                fullname = objtype.__qualname__
-            else:
-                fullname = objmodule + "." + objtype.__qualname__
-
-            if not _try_loading_parts(
-                identifier=fullname,
-                entry_point_mapping=_get_entrypoint_mapping("fsc.hdf5_io.save"),
-            ):
-                raise TypeError(
-                    f"Cannot serialize object of type '{fullname}', and no corresponding entry point found."
-                ) from exc
-            to_hdf5_singledispatch(obj, hdf5_handle)
+        return None
+    objtype = type(obj)
+    if to_hdf5_singledispatch.dispatch(objtype) in _generic_serializers():
+        _load_save_entrypoint(objtype)
+    try:
+        return to_hdf5_singledispatch(obj, hdf5_handle)
+    except SerializerNotFound as exc:
+        raise TypeError(
+            f"Cannot serialize object of type '{_get_fullname(objtype)}', and no corresponding entry point found."
+        ) from exc
+
+
+def _generic_serializers():
+    """
+    Returns the serializers which are used for types without a specific
+    serializer: the default, and the ones for generic iterables and mappings.
+    """
+    registry = to_hdf5_singledispatch.registry
+    return (registry[object], registry.get(Iterable), registry.get(Mapping))
+
+
+@lru_cache(maxsize=None)
+def _load_save_entrypoint(objtype):
+    """
+    Loads the 'fsc.hdf5_io.save' entry point matching the given type, if any.
+    Types which match only a generic serializer can have a specific one
+    defined in an entry point, for example iterable or dict-based matrix
+    types.
+    """
+    return _try_loading_parts(
+        identifier=_get_fullname(objtype),
+        entry_point_mapping=_get_entrypoint_mapping("fsc.hdf5_io.save"),
+    )
+
+
+def _get_fullname(objtype):
+    objmodule = objtype.__module__
+    if objmodule is None:
+        return objtype.__qualname__
+    return objmodule + "." + objtype.__qualname__
 
 
 class SerializerNotFound(TypeError):
@@ -132,6 +264,11 @@ def to_hdf5_singledispatch(obj, hdf5_handle):
     """
     Singledispatch function which is called to serialize and object when it does not have a ``to_hdf5`` method.
 
+    Functions registered for container types can return an iterable of
+    ``(child, name)`` pairs instead of serializing the children themselves.
+    Each child is then serialized into a new group ``name`` created below
+    ``hdf5_handle``, without increasing the recursion depth.
+
     :param obj: Object to serialize.
 
     :param hdf5_handle: HDF5 location where the serialized object gets stored.
@@ -141,15 +278,49 @@ def to_hdf5_singledispatch(obj, hdf5_handle):
 
 
 @export
-def from_hdf5_file(hdf5_file):
+def from_hdf5_file(
+    hdf5_file,
+    comm=None,
+    profile=None,
+    file_options=None,
+    backend=None,
+    plan_cache=None,
+    **kwargs,
+):
     """
     Loads the object from a file in HDF5 format.
 
-    :param hdf5_file: Path of the file.
+    :param hdf5_file: Path of the file, or a :class:`.Store`.
     :type hdf5_file: str
+
+    :param comm: MPI communicator. If given, the file is opened collectively with the ``mpio`` driver, and each rank loads its block of any :class:`.DistributedArray`.
+    :type comm: mpi4py.MPI.Comm
+
+    :param profile: Name of a profile of HDF5 file settings, see :func:`to_hdf5_file`. Settings which only apply when creating a file are ignored.
+    :type profile: str
+
+    :param file_options: Keyword arguments for :py:class:`h5py.File<File>`, which take precedence over the profile.
+    :type file_options: dict
+
+    :param backend: Name of the storage backend, see :func:`to_hdf5_file`.
+    :type backend: str
+
+    :param plan_cache: Cache of load plans, which speeds up loading many files with the same structure.
+    :type plan_cache: LoadPlanCache
+
+    Additional keyword arguments are passed to :func:`from_hdf5`.
     """
-    with h5py.File(hdf5_file, "r") as f:
-        return from_hdf5(f)
+    if backend is not None or isinstance(hdf5_file, Store):
+        _check_hdf5_only(comm=comm, profile=profile, file_options=file_options)
+        with _store_root(hdf5_file, "r", backend) as root:
+            return from_hdf5(root, **kwargs)
+    file_kwargs = _get_file_kwargs(
+        mode="r", comm=comm, profile=profile, file_options=file_options
+    )
+    with h5py.File(hdf5_file, "r", **file_kwargs) as f:
+        if plan_cache is not None:
+            return plan_cache.from_hdf5(f, **kwargs)
+        return from_hdf5(f, **kwargs)
 
 
 load = from_hdf5_file  # pylint: disable=invalid-name
@@ -157,18 +328,127 @@ load.__doc__ = """Alias for :func:`from_hdf5_file`."""
 
 
 @export
-def to_hdf5_file(obj, hdf5_file):
+def to_hdf5_file(
+    obj,
+    hdf5_file,
+    atomic=False,
+    comm=None,
+    profile=None,
+    file_options=None,
+    backend=None,
+    **options,
+):
     """
     Saves the object to a file, in HDF5 format.
 
     :param obj: The object to be saved.
 
-    :param hdf5_file: Path of the file.
+    :param hdf5_file: Path of the file, or an empty :class:`.Store`.
     :type hdf5_file: str
+
+    :param atomic: If set, the object is first written to a temporary file in the same directory, which is then renamed to ``hdf5_file``. An existing file is thus never left in a partially written state.
+    :type atomic: bool
+
+    :param comm: MPI communicator. If given, the file is written collectively with the ``mpio`` driver. All ranks must save objects of the same structure, where each rank contributes its block of any :class:`.DistributedArray`.
+    :type comm: mpi4py.MPI.Comm
+
+    :param profile: Name of a profile of HDF5 file settings. The ``'many-small-objects'`` profile uses the latest file format, and aggregates metadata into pages which are cached by a page buffer. This speeds up nested containers and other trees with many groups. The ``'few-large-arrays'`` profile uses a large chunk cache, and aligns large datasets to 1 MiB. By default, the HDF5 defaults are used.
+    :type profile: str
+
+    :param file_options: Keyword arguments for :py:class:`h5py.File<File>`, which take precedence over the profile. For example ``rdcc_nbytes``, ``rdcc_nslots``, ``libver``, ``fs_strategy``, ``fs_page_size``, ``page_buf_size``, ``meta_block_size``, ``alignment_threshold`` or ``alignment_interval``.
+    :type file_options: dict
+
+    :param backend: Name of a storage backend registered with :func:`.register_backend`, which is used instead of HDF5. The ``'directory'`` backend stores groups as directories and arrays as ``.npy`` files, the ``'zarr'`` backend uses a zarr group. The MPI, atomic and HDF5 file settings are only supported for HDF5.
+    :type backend: str
+
+    Additional keyword arguments are save options, see :func:`to_hdf5`.
     """
-    with h5py.File(hdf5_file, "w") as f:
-        to_hdf5(obj, f)
+    if backend is not None or isinstance(hdf5_file, Store):
+        _check_hdf5_only(
+            atomic=atomic, comm=comm, profile=profile, file_options=file_options
+        )
+        with _store_root(hdf5_file, "w", backend) as root:
+            to_hdf5(obj, root, **options)
+        return
+    file_kwargs = _get_file_kwargs(
+        mode="w", comm=comm, profile=profile, file_options=file_options
+    )
+    if not atomic:
+        with h5py.File(hdf5_file, "w", **file_kwargs) as f:
+            to_hdf5(obj, f, **options)
+        return
+    with _atomic_target(hdf5_file, comm) as tmp_file:
+        with h5py.File(tmp_file, "w", **file_kwargs) as f:
+            to_hdf5(obj, f, **options)
 
 
 save = to_hdf5_file  # pylint: disable=invalid-name
 save.__doc__ = """Alias for :func:`to_hdf5_file`."""
+
+
+def _get_file_kwargs(*, mode, comm, profile, file_options):
+    """
+    Returns the keyword arguments to open a file with the given profile, and
+    collectively on the given MPI communicator, if any.
+    """
+    res = get_file_kwargs(mode=mode, profile=profile, file_options=file_options)
+    if comm is not None:
+        res.update(driver="mpio", comm=comm)
+    return res
+
+
+def _check_hdf5_only(**kwargs):
+    """
+    Raises a ValueError if any of the given HDF5-only arguments is set.
+    """
+    for name, value in kwargs.items():
+        if value:
+            raise ValueError(f"The '{name}' argument is only supported for HDF5 files.")
+
+
+@contextlib.contextmanager
+def _store_root(target, mode, backend):
+    """
+    Context manager which yields the root group of the store for the given
+    target. Stores which are opened from a path are closed on exit, while a
+    given store is only flushed.
+    """
+    store = open_store(target, mode, backend)
+    try:
+        yield store.root
+    finally:
+        if store is target:
+            if mode != "r":
+                store.flush()
+        else:
+            store.close()
+
+
+@contextlib.contextmanager
+def _atomic_target(hdf5_file, comm=None):
+    """
+    Context manager which creates a temporary file in the same directory as
+    the given file, and renames it to the given file on success. With an MPI
+    communicator, the same temporary file is used on all ranks.
+    """
+    is_root = comm is None or comm.rank == 0
+    tmp_file = None
+    if is_root:
+        dirname, basename = os.path.split(os.path.abspath(hdf5_file))
+        fd, tmp_file = tempfile.mkstemp(
+            prefix=f".{basename}.", suffix=".tmp", dir=dirname
+        )
+        os.close(fd)
+    if comm is not None:
+        tmp_file = comm.bcast(tmp_file, root=0)
+    try:
+        yield tmp_file
+        if comm is not None:
+            comm.Barrier()
+        if is_root:
+            os.replace(tmp_file, hdf5_file)
+    except BaseException:
+        if is_root:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_file)
+        raise
@@ -0,0 +1,37 @@
+"""
+Module defining the deserialization method for scipy.sparse matrices and
+arrays.
+"""
+
+from ._special_types import Deserializable, _SpecialTypeTags
+from ._subscribe import subscribe_hdf5
+from ._utils import decode_if_needed
+
+
+@subscribe_hdf5(_SpecialTypeTags.SCIPY_SPARSE)
+class _ScipySparseDeserializer(Deserializable):
+    """Helper class to de-serialize scipy.sparse matrices and arrays."""
+
+    @classmethod
+    def from_hdf5(cls, hdf5_handle):
+        import scipy.sparse  # pylint: disable=import-outside-toplevel
+
+        sparse_format = decode_if_needed(hdf5_handle["format"][()])
+        shape = tuple(int(x) for x in hdf5_handle["shape"][()])
+        if hdf5_handle["sparse_array"][()]:
+            suffix = "array"
+        else:
+            suffix = "matrix"
+        data = hdf5_handle["data"][()]
+        if "indptr" in hdf5_handle:
+            storage_format = sparse_format
+            if storage_format not in ("csr", "csc", "bsr"):
+                storage_format = "csr"
+            components = (data, hdf5_handle["indices"][()], hdf5_handle["indptr"][()])
+        else:
+            storage_format = "coo"
+            components = (data, (hdf5_handle["row"][()], hdf5_handle["col"][()]))
+        res = getattr(scipy.sparse, f"{storage_format}_{suffix}")(
+            components, shape=shape
+        )
+        return res.asformat(sparse_format)
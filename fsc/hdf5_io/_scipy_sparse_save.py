@@ -0,0 +1,54 @@
+"""
+Module defining the serialization method for scipy.sparse matrices and
+arrays.
+"""
+
+import numpy as np
+import scipy.sparse
+
+from ._special_types import (
+    _compression_kwargs,
+    _SpecialTypeTags,
+    add_type_tag,
+    to_hdf5_singledispatch,
+)
+
+# Formats which are stored with their own components. Other formats are
+# converted to CSR.
+_COMPRESSED_FORMATS = ("csr", "csc", "bsr")
+
+# The concrete classes are registered, because the sparse base classes would
+# rank below the generic Iterable and Mapping ABCs in the dispatch.
+_SPARSE_BASES = tuple(
+    getattr(scipy.sparse, name)
+    for name in ["spmatrix", "sparray"]
+    if hasattr(scipy.sparse, name)
+)
+_SPARSE_CLASSES = [
+    value
+    for value in vars(scipy.sparse).values()
+    if isinstance(value, type) and issubclass(value, _SPARSE_BASES)
+]
+
+
+@add_type_tag(_SpecialTypeTags.SCIPY_SPARSE)
+def _sparse_serializer(obj, hdf5_handle):
+    """
+    Stores the format, shape and components of a sparse matrix as typed
+    datasets.
+    """
+    hdf5_handle["format"] = obj.format
+    hdf5_handle["shape"] = np.array(obj.shape, dtype=np.int64)
+    hdf5_handle["sparse_array"] = not isinstance(obj, scipy.sparse.spmatrix)
+    if obj.format == "coo":
+        components = {"data": obj.data, "row": obj.row, "col": obj.col}
+    else:
+        if obj.format not in _COMPRESSED_FORMATS:
+            obj = obj.tocsr()
+        components = {"data": obj.data, "indices": obj.indices, "indptr": obj.indptr}
+    for name, value in components.items():
+        hdf5_handle.create_dataset(name, data=value, **_compression_kwargs(value))
+
+
+for _cls in _SPARSE_CLASSES:
+    to_hdf5_singledispatch.register(_cls)(_sparse_serializer)
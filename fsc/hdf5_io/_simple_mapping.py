@@ -23,10 +23,14 @@ class SimpleHDF5Mapping(HDF5Enabled):
     For attributes which *can* be serialized but are not required, it can also
     define a list ``HDF5_OPTIONAL``. The same logic as for the ``HDF5_ATTRIBUTES``
     applies, but no error is raised if an attribute does not exist.
+
+    A dictionary ``HDF5_PRECISION`` can map attribute names to the lossy
+    ``precision`` save option (see :func:`.to_hdf5`) used for that attribute.
     """
 
     HDF5_ATTRIBUTES = ()
     HDF5_OPTIONAL = ()
+    HDF5_PRECISION = {}
 
     @classmethod
     def from_hdf5(cls, hdf5_handle):
@@ -52,6 +56,13 @@ class SimpleHDF5Mapping(HDF5Enabled):
                 to_serialize.append((key, getattr(self, key)))
 
         for key, value in to_serialize:
+            if key in self.HDF5_PRECISION:
+                _global_to_hdf5(
+                    value,
+                    hdf5_handle.create_group(key),
+                    precision=self.HDF5_PRECISION[key],
+                )
+                continue
             try:
                 hdf5_handle[key] = value
             except TypeError:
@@ -7,15 +7,26 @@ from functools import singledispatch
 from numbers import Complex
 from types import SimpleNamespace
 
+import h5py
 import numpy as np
 
 from ._base_classes import Deserializable
-from ._save_load import from_hdf5, to_hdf5, to_hdf5_singledispatch
+from ._options import get_save_option
+from ._save_load import _run_deserializer, to_hdf5_singledispatch
 from ._subscribe import TYPE_TAG_KEY, subscribe_hdf5
 from ._utils import decode_if_needed
 
 __all__ = []
 
+# Prefix of the attribute holding the type tag of a compactly stored value.
+_COMPACT_TAG_PREFIX = TYPE_TAG_KEY + ":"
+# Maximum size of strings and bytes which are stored compactly.
+_COMPACT_MAX_BYTES = 1024
+# Attribute of arrays stored with reduced precision, holding their dtype.
+_ORIGINAL_DTYPE_KEY = "original_dtype"
+# Key storing the axis along which an array is distributed across MPI ranks.
+_DISTRIBUTED_AXIS_KEY = "distributed_axis"
+
 
 class _SpecialTypeTags(SimpleNamespace):
     """
@@ -30,48 +41,113 @@ class _SpecialTypeTags(SimpleNamespace):
     BYTES = "builtins.bytes"
     NONE = "builtins.none"
     NUMPY_ARRAY = "numpy.ndarray"
-    SYMPY = "sympy.object"  # defined in _sympy_load.py and _sympy_save.py
+    # defined in _sympy_load.py and _sympy_save.py
+    SYMPY = "sympy.object"
+    SYMPY_EXPRESSION = "sympy.object.expression"
+    SYMPY_MATRIX = "sympy.object.matrix"
+    # defined in _scipy_sparse_load.py and _scipy_sparse_save.py
+    SCIPY_SPARSE = "scipy.sparse"
+    # defined in _pandas_load.py and _pandas_save.py
+    PANDAS_DATAFRAME = "pandas.dataframe"
+    PANDAS_SERIES = "pandas.series"
+    PANDAS_INDEX = "pandas.index"
+
+
+class _IterativeDeserializable(Deserializable):
+    """
+    Base class for helper classes which de-serialize nested objects with the
+    explicit-stack engine, by defining a generator ``iter_from_hdf5``.
+    """
+
+    @classmethod
+    def from_hdf5(cls, hdf5_handle):
+        return _run_deserializer(cls.iter_from_hdf5(hdf5_handle))
+
+    @classmethod
+    def iter_from_hdf5(cls, hdf5_handle):
+        """
+        Generator which yields the HDF5 handles of the child objects, is sent
+        back the de-serialized children, and returns the de-serialized object.
+        """
+        raise NotImplementedError
 
 
 @subscribe_hdf5(_SpecialTypeTags.DICT)
-class _DictDeserializer(Deserializable):
+class _DictDeserializer(_IterativeDeserializable):
     """Helper class to de-serialize dict objects."""
 
     @classmethod
-    def from_hdf5(cls, hdf5_handle):
-        try:
-            items = from_hdf5(hdf5_handle["items"])
+    def iter_from_hdf5(cls, hdf5_handle):
+        if "items" in hdf5_handle:
+            items = yield hdf5_handle["items"]
             return {_ensure_hashable(k): v for k, v in items}
         # Handle legacy dicts with only string keys:
-        except KeyError:
-            res = dict()
-            value_group = hdf5_handle["value"]
-            for key in value_group:
-                res[key] = from_hdf5(value_group[key])
-            return res
+        res = dict()
+        value_group = hdf5_handle["value"]
+        for key in value_group:
+            res[key] = yield value_group[key]
+        return res
 
 
 @subscribe_hdf5(_SpecialTypeTags.LIST)
-class _ListDeserializer(Deserializable):
+class _ListDeserializer(_IterativeDeserializable):
     """Helper class to de-serialize list objects."""
 
     @classmethod
-    def from_hdf5(cls, hdf5_handle):
-        return _deserialize_iterable(hdf5_handle)
+    def iter_from_hdf5(cls, hdf5_handle):
+        return (yield from _iter_deserialize_iterable(hdf5_handle))
 
 
 @subscribe_hdf5(_SpecialTypeTags.TUPLE)
-class _TupleDeserializer(Deserializable):
+class _TupleDeserializer(_IterativeDeserializable):
     """Helper class to de-serialize tuple objects."""
 
     @classmethod
-    def from_hdf5(cls, hdf5_handle):
-        return tuple(_deserialize_iterable(hdf5_handle))
+    def iter_from_hdf5(cls, hdf5_handle):
+        return tuple((yield from _iter_deserialize_iterable(hdf5_handle)))
 
 
-def _deserialize_iterable(hdf5_handle):
+def _iter_deserialize_iterable(hdf5_handle):
+    compact_tags = _get_compact_tags(hdf5_handle)
     int_keys = [key for key in hdf5_handle if key != TYPE_TAG_KEY]
-    return [from_hdf5(hdf5_handle[key]) for key in sorted(int_keys, key=int)]
+    int_keys.extend(compact_tags)
+    res = []
+    for key in sorted(int_keys, key=int):
+        if key in compact_tags:
+            res.append(_read_compact(hdf5_handle, key, compact_tags[key]))
+        else:
+            res.append((yield hdf5_handle[key]))
+    return res
+
+
+def _get_compact_tags(hdf5_handle):
+    """
+    Returns a dict mapping the names of values stored as attributes of the
+    given group to their type tags.
+    """
+    return {
+        name[len(_COMPACT_TAG_PREFIX) :]: decode_if_needed(tag)
+        for name, tag in hdf5_handle.attrs.items()
+        if name.startswith(_COMPACT_TAG_PREFIX)
+    }
+
+
+def _read_compact(hdf5_handle, name, type_tag):
+    """
+    Reads a value which is stored as an attribute of the given group.
+    """
+    if type_tag == _SpecialTypeTags.NONE:
+        return None
+    value = hdf5_handle.attrs[name]
+    if type_tag == _SpecialTypeTags.NUMBER:
+        return value
+    if type_tag == _SpecialTypeTags.STR:
+        return decode_if_needed(value)
+    if type_tag == _SpecialTypeTags.BYTES:
+        return value.tobytes()
+    raise ValueError(
+        f"Invalid type tag '{type_tag}' for attribute '{name}' of HDF5 object '{hdf5_handle.name}'."
+    )
 
 
 @subscribe_hdf5(_SpecialTypeTags.NUMBER, extra_tags=(_SpecialTypeTags.BYTES,))
@@ -93,14 +169,44 @@ class _StringDeserializer(Deserializable):
 
 
 @subscribe_hdf5(_SpecialTypeTags.NUMPY_ARRAY)
-class _NumpyArraryDeserializer(Deserializable):
+class _NumpyArraryDeserializer(_IterativeDeserializable):
     """Helper class to de-serialize numpy arrays."""
 
     @classmethod
-    def from_hdf5(cls, hdf5_handle):
+    def iter_from_hdf5(cls, hdf5_handle):
         if "value" in hdf5_handle:
-            return hdf5_handle["value"][()]
-        return np.array(_deserialize_iterable(hdf5_handle))
+            if (
+                _DISTRIBUTED_AXIS_KEY in hdf5_handle
+                and hdf5_handle.file.driver == "mpio"
+            ):
+                from ._mpi import (  # pylint: disable=import-outside-toplevel
+                    load_distributed_array,
+                )
+
+                return load_distributed_array(hdf5_handle)
+            if "dtype" in hdf5_handle:
+                return _read_converted_array(hdf5_handle)
+            value = hdf5_handle["value"]
+            if _ORIGINAL_DTYPE_KEY in value.attrs:
+                original_dtype = decode_if_needed(value.attrs[_ORIGINAL_DTYPE_KEY])
+                return value[()].astype(original_dtype)
+            return value[()]
+        return np.array((yield from _iter_deserialize_iterable(hdf5_handle)))
+
+
+def _read_converted_array(hdf5_handle):
+    """
+    Reads an array which was converted to a different dtype when saving,
+    and converts it back to the dtype stored in the ``dtype`` dataset.
+    """
+    dtype = np.dtype(decode_if_needed(hdf5_handle["dtype"][()]))
+    value = hdf5_handle["value"]
+    if h5py.check_string_dtype(value.dtype) is not None:
+        return np.asarray(value.asstr()[()], dtype=object).astype(dtype)
+    data = np.asarray(value[()])
+    res = np.empty(data.shape, dtype=object)
+    res.reshape(-1)[:] = data.reshape(-1).tolist()
+    return res
 
 
 @subscribe_hdf5(_SpecialTypeTags.NONE)
@@ -120,7 +226,7 @@ def add_type_tag(tag):
     def outer(func):
         def inner(obj, hdf5_handle):
             hdf5_handle[TYPE_TAG_KEY] = tag
-            func(obj, hdf5_handle)
+            return func(obj, hdf5_handle)
 
         return inner
 
@@ -130,26 +236,69 @@ def add_type_tag(tag):
 @to_hdf5_singledispatch.register(Iterable)
 @add_type_tag(_SpecialTypeTags.LIST)
 def _(obj, hdf5_handle):
-    _serialize_iterable(obj, hdf5_handle)
+    return _serialize_iterable(obj, hdf5_handle)
 
 
 @to_hdf5_singledispatch.register(tuple)
 @add_type_tag(_SpecialTypeTags.TUPLE)
 def _(obj, hdf5_handle):
-    _serialize_iterable(obj, hdf5_handle)
+    return _serialize_iterable(obj, hdf5_handle)
 
 
 def _serialize_iterable(obj, hdf5_handle):
-    for i, part in enumerate(obj):
-        sub_group = hdf5_handle.create_group(str(i))
-        to_hdf5(part, sub_group)
+    children = ((part, str(i)) for i, part in enumerate(obj))
+    if get_save_option("compact"):
+        return _serialize_compact(children, hdf5_handle)
+    return children
+
+
+def _serialize_compact(children, hdf5_handle):
+    """
+    Writes the children which can be stored compactly as attributes of the
+    given group, and yields the remaining ones.
+    """
+    for part, name in children:
+        if not _write_compact(part, hdf5_handle, name):
+            yield part, name
+
+
+def _write_compact(obj, hdf5_handle, name):
+    """
+    Tries to store the given object as attribute ``name`` of the HDF5 group,
+    returning whether this succeeded.
+    """
+    if hasattr(obj, "to_hdf5"):
+        return False
+    if obj is None:
+        type_tag = _SpecialTypeTags.NONE
+    elif isinstance(obj, str):
+        value = str(obj)
+        if len(value.encode("utf-8")) > _COMPACT_MAX_BYTES:
+            return False
+        type_tag = _SpecialTypeTags.STR
+        hdf5_handle.attrs[name] = value
+    elif isinstance(obj, bytes):
+        # HDF5 does not support empty opaque values
+        if not obj or len(obj) > _COMPACT_MAX_BYTES:
+            return False
+        type_tag = _SpecialTypeTags.BYTES
+        hdf5_handle.attrs[name] = np.void(obj)
+    elif isinstance(obj, Complex):
+        try:
+            hdf5_handle.attrs[name] = obj
+        except (TypeError, OverflowError):
+            return False
+        type_tag = _SpecialTypeTags.NUMBER
+    else:
+        return False
+    hdf5_handle.attrs[_COMPACT_TAG_PREFIX + name] = type_tag
+    return True
 
 
 @to_hdf5_singledispatch.register(Mapping)
 @add_type_tag(_SpecialTypeTags.DICT)
-def _(obj, hdf5_handle):
-    items_group = hdf5_handle.create_group("items")
-    to_hdf5(obj.items(), items_group)
+def _(obj, hdf5_handle):  # pylint: disable=unused-argument
+    return [(obj.items(), "items")]
 
 
 @to_hdf5_singledispatch.register(Complex)
@@ -179,17 +328,175 @@ def _(obj, hdf5_handle):
 
 @to_hdf5_singledispatch.register(np.ndarray)
 @add_type_tag(_SpecialTypeTags.NUMPY_ARRAY)
-def _(obj, hdf5_handle):  # pylint: disable=missing-docstring
+def _(obj, hdf5_handle):
+    return _serialize_array(obj, hdf5_handle)
+
+
+@to_hdf5_singledispatch.register(h5py.Dataset)
+@add_type_tag(_SpecialTypeTags.NUMPY_ARRAY)
+def _(obj, hdf5_handle):
+    # Datasets of another file are copied block-wise, without reading them
+    # into memory at once.
+    if obj.shape is None or obj.size == 0 or obj.dtype.kind in "OSU":
+        return _serialize_array(np.asarray(obj[()]), hdf5_handle)
+    if not _lossy_serializer(obj, hdf5_handle):
+        _block_serializer(obj, hdf5_handle)
+    return None
+
+
+def _serialize_array(obj, hdf5_handle):  # pylint: disable=missing-docstring
+    if obj.dtype.kind == "U" or (
+        obj.dtype == object and all(isinstance(x, str) for x in obj.flat)
+    ):
+        hdf5_handle.create_dataset(
+            "value",
+            data=obj.astype(object),
+            dtype=h5py.string_dtype(),
+            **_compression_kwargs(obj),
+        )
+        hdf5_handle["dtype"] = obj.dtype.str
+        return None
+    if obj.dtype == object:
+        element_types = {type(x) for x in obj.flat}
+        if len(element_types) == 1 and element_types <= _PRIMITIVE_ARRAY_TYPES:
+            data = np.array(obj.tolist())
+            if data.shape == obj.shape and data.dtype != object:
+                _value_serializer(data, hdf5_handle)
+                hdf5_handle["dtype"] = obj.dtype.str
+                return None
+    if _lossy_serializer(obj, hdf5_handle):
+        return None
     try:
-        _value_serializer(obj, hdf5_handle)
+        if obj.size > 0 and (
+            obj.nbytes > get_save_option("block_size") or not obj.flags.c_contiguous
+        ):
+            _block_serializer(obj, hdf5_handle)
+        else:
+            _value_serializer(obj, hdf5_handle)
     except TypeError:
         # if the numpy dtype does not have a native HDF5 equivalent,
         # treat it as an iterable instead
-        _serialize_iterable(obj, hdf5_handle)
+        return _serialize_iterable(obj, hdf5_handle)
+    return None
+
+
+# Element types of object arrays which are stored as a typed array.
+_PRIMITIVE_ARRAY_TYPES = {bool, int, float, complex}
+
+
+def _block_serializer(obj, hdf5_handle, dtype=None, transform=None, **kwargs):
+    """
+    Writes an array-like object to the 'value' dataset in blocks of at most
+    'block_size' bytes. Each block of a strided view or memory-mapped array
+    is copied separately, such that the memory use is bounded by the block
+    size instead of the size of the array.
+
+    The dataset is created with the given dtype and keyword arguments, and
+    the optional ``transform`` is applied to each block before writing it.
+    """
+    kwargs = {**_compression_kwargs(obj), **kwargs}
+    dataset = hdf5_handle.create_dataset(
+        "value", shape=obj.shape, dtype=dtype or obj.dtype, **kwargs
+    )
+    for selection in _iter_blocks(
+        obj.shape, obj.dtype.itemsize, get_save_option("block_size")
+    ):
+        block = obj[selection]
+        if transform is not None:
+            block = transform(block)
+        dataset[selection] = block
+    return dataset
+
+
+def _lossy_serializer(obj, hdf5_handle):
+    """
+    Writes a floating-point array with the reduced precision given by the
+    'precision' save option, and records its original dtype. Returns False
+    if the array is stored unchanged.
+    """
+    precision = get_save_option("precision")
+    if precision is None or obj.dtype.kind != "f" or obj.ndim == 0 or obj.size == 0:
+        return False
+    if isinstance(precision, tuple):
+        method, digits = precision
+        if method == "scaleoffset":
+            dataset = _block_serializer(obj, hdf5_handle, scaleoffset=digits)
+        elif method == "bitround":
+            # Rounded mantissas only save space when they are compressed.
+            kwargs = {}
+            if get_save_option("compression") is None:
+                kwargs = {"compression": "gzip", "shuffle": True}
+            keepbits = int(np.ceil(digits * np.log2(10)))
+            dataset = _block_serializer(
+                obj,
+                hdf5_handle,
+                transform=lambda block: _round_bits(block, keepbits),
+                **kwargs,
+            )
+        else:
+            raise ValueError(f"Unknown precision method '{method}'.")
+    else:
+        dtype = np.dtype(precision)
+        if dtype.kind != "f":
+            raise ValueError(f"Precision '{precision}' is not a floating-point type.")
+        if dtype.itemsize >= obj.dtype.itemsize:
+            return False
+        dataset = _block_serializer(obj, hdf5_handle, dtype=dtype)
+    dataset.attrs[_ORIGINAL_DTYPE_KEY] = obj.dtype.str
+    return True
+
+
+def _round_bits(array, keepbits):
+    """
+    Rounds the mantissa of a floating-point array to the given number of
+    bits, setting the remaining bits to zero. Non-finite values are kept.
+    """
+    array = np.asarray(array)
+    num_drop = np.finfo(array.dtype).nmant - keepbits
+    if num_drop <= 0:
+        return array
+    uint_type = np.dtype(f"u{array.dtype.itemsize}").type
+    bits = array.view(uint_type)
+    rounded = (bits + uint_type(1 << (num_drop - 1))) & ~uint_type((1 << num_drop) - 1)
+    return np.where(np.isfinite(array), rounded.view(array.dtype), array)
+
+
+def _iter_blocks(shape, itemsize, block_size):
+    """
+    Returns the selections of C-ordered blocks which cover an array of the
+    given shape, each with at most 'block_size' bytes (or a single element).
+    """
+    # Find the outermost axis along which slabs fit into a block.
+    axis = len(shape) - 1
+    slab_bytes = itemsize
+    while axis > 0 and slab_bytes * shape[axis] <= block_size:
+        slab_bytes *= shape[axis]
+        axis -= 1
+    step = max(1, block_size // slab_bytes)
+    for index in np.ndindex(*shape[:axis]):
+        for start in range(0, shape[axis], step):
+            yield index + (slice(start, min(start + step, shape[axis])),)
 
 
 def _value_serializer(obj, hdf5_handle):
-    hdf5_handle["value"] = obj
+    compression_kwargs = _compression_kwargs(obj)
+    if compression_kwargs:
+        hdf5_handle.create_dataset("value", data=obj, **compression_kwargs)
+    else:
+        hdf5_handle["value"] = obj
+
+
+def _compression_kwargs(obj):
+    """
+    Returns the dataset creation keywords for the 'compression' save option.
+    """
+    compression = get_save_option("compression")
+    if compression is None or not np.ndim(obj) or obj.size == 0:
+        return {}
+    return {
+        "compression": compression,
+        "compression_opts": get_save_option("compression_opts"),
+    }
 
 
 def _ensure_hashable(obj):
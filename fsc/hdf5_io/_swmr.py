@@ -0,0 +1,147 @@
+"""
+Defines helpers for writing arrays which can be read while they are being
+written, using the HDF5 single-writer / multiple-reader (SWMR) mode.
+"""
+
+import h5py
+import numpy as np
+
+from fsc.export import export
+
+from ._special_types import _SpecialTypeTags
+from ._subscribe import TYPE_TAG_KEY
+
+__all__ = []
+
+
+@export
+class SWMRArrayWriter:
+    """
+    Writes a numpy array to a file, by appending elements along its first
+    axis. The file is opened in single-writer / multiple-reader (SWMR) mode,
+    such that :class:`SWMRArrayReader` instances can read the elements
+    while they are being appended. Each call to :meth:`append` or
+    :meth:`extend` is flushed to the file.
+
+    The resulting file can be loaded as a numpy array with :func:`.load`.
+
+    :param hdf5_file: Path of the file.
+    :type hdf5_file: str
+
+    :param dtype: Data type of the array.
+    :type dtype: numpy.dtype
+
+    :param shape: Shape of the appended elements.
+    :type shape: tuple(int)
+
+    :param chunk_size: Number of elements per HDF5 chunk.
+    :type chunk_size: int
+    """
+
+    def __init__(self, hdf5_file, dtype, shape=(), chunk_size=1024):
+        self._element_shape = tuple(shape)
+        self._file = h5py.File(hdf5_file, "w", libver="latest")
+        try:
+            self._file[TYPE_TAG_KEY] = _SpecialTypeTags.NUMPY_ARRAY
+            self._dataset = self._file.create_dataset(
+                "value",
+                shape=(0,) + self._element_shape,
+                maxshape=(None,) + self._element_shape,
+                chunks=(chunk_size,) + self._element_shape,
+                dtype=dtype,
+            )
+            self._file.swmr_mode = True
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._dataset.shape[0]
+
+    def append(self, value):
+        """
+        Appends a single element to the array.
+        """
+        self.extend(np.asarray(value)[np.newaxis, ...])
+
+    def extend(self, values):
+        """
+        Appends multiple elements to the array.
+
+        :param values: Array of shape ``(n,) + shape``.
+        :type values: numpy.ndarray
+        """
+        values = np.asarray(values)
+        if values.shape[1:] != self._element_shape:
+            raise ValueError(
+                f"Cannot append elements of shape {values.shape[1:]} to an array with elements of shape {self._element_shape}."
+            )
+        old_size = len(self)
+        self._dataset.resize(old_size + len(values), axis=0)
+        self._dataset[old_size:] = values
+        self._dataset.flush()
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        self._file.close()
+
+
+@export
+class SWMRArrayReader:
+    """
+    Reads an array written by :class:`SWMRArrayWriter`, while it is being
+    written.
+
+    :param hdf5_file: Path of the file.
+    :type hdf5_file: str
+    """
+
+    def __init__(self, hdf5_file):
+        self._file = h5py.File(hdf5_file, "r", libver="latest", swmr=True)
+        self._dataset = self._file["value"]
+        self._position = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        self._dataset.refresh()
+        return self._dataset.shape[0]
+
+    def read_new(self):
+        """
+        Returns the elements which were appended since the last call.
+
+        :rtype: numpy.ndarray
+        """
+        size = len(self)
+        res = self._dataset[self._position : size]
+        self._position = size
+        return res
+
+    def read_all(self):
+        """
+        Returns all elements written so far.
+
+        :rtype: numpy.ndarray
+        """
+        size = len(self)
+        self._position = size
+        return self._dataset[:size]
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        self._file.close()
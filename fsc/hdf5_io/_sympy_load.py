@@ -2,11 +2,41 @@
 Module defining the deserialization method for sympy objects.
 """
 
+import importlib
+from functools import lru_cache
+from types import SimpleNamespace
+
 from ._special_types import Deserializable, _SpecialTypeTags
 from ._subscribe import subscribe_hdf5
 from ._utils import decode_if_needed
 
 
+class _SympyNodeKind(SimpleNamespace):
+    """
+    Defines how the head of a node in the sympy expression table is
+    interpreted.
+    """
+
+    ATOM = 0  # sympified, the node has no arguments
+    CLASS = 1  # import path of a class, called with the arguments
+    FUNCTION = 2  # sympified, called with the arguments
+
+
+@lru_cache(maxsize=2**14)
+def _sympify_cached(value):
+    import sympy  # pylint: disable=import-outside-toplevel
+
+    return sympy.sympify(value)
+
+
+@lru_cache(maxsize=None)
+def _import_class(class_path):
+    module_name, name = class_path.rsplit(".", 1)
+    if not module_name.startswith("sympy."):
+        raise ValueError(f"Invalid sympy class '{class_path}'.")
+    return getattr(importlib.import_module(module_name), name)
+
+
 @subscribe_hdf5(_SpecialTypeTags.SYMPY)
 class _SympyDeserializer(Deserializable):
     """Helper class to de-serialize sympy objects."""
@@ -15,4 +45,61 @@ class _SympyDeserializer(Deserializable):
     def from_hdf5(cls, hdf5_handle):
         import sympy  # pylint: disable=import-outside-toplevel
 
-        return sympy.sympify(decode_if_needed(hdf5_handle["value"][()]))
+        res = _sympify_cached(decode_if_needed(hdf5_handle["value"][()]))
+        # cached matrices must not be shared, since they can be mutable
+        if isinstance(res, sympy.MatrixBase):
+            return res.copy()
+        return res
+
+
+@subscribe_hdf5(_SpecialTypeTags.SYMPY_EXPRESSION)
+class _SympyExpressionDeserializer(Deserializable):
+    """Helper class to de-serialize sympy expressions."""
+
+    @classmethod
+    def from_hdf5(cls, hdf5_handle):
+        nodes = _load_expression_table(hdf5_handle)
+        return nodes[hdf5_handle["root"][()]]
+
+
+@subscribe_hdf5(_SpecialTypeTags.SYMPY_MATRIX)
+class _SympyMatrixDeserializer(Deserializable):
+    """Helper class to de-serialize sympy matrices."""
+
+    @classmethod
+    def from_hdf5(cls, hdf5_handle):
+        import sympy  # pylint: disable=import-outside-toplevel
+
+        matrix_class = _import_class(decode_if_needed(hdf5_handle["matrix_class"][()]))
+        num_rows, num_cols = (int(size) for size in hdf5_handle["shape"][()])
+        nodes = _load_expression_table(hdf5_handle)
+        flat_entries = [sympy.S.Zero] * (num_rows * num_cols)
+        for row, col, entry in zip(
+            hdf5_handle["row"][()], hdf5_handle["col"][()], hdf5_handle["entry"][()]
+        ):
+            flat_entries[row * num_cols + col] = nodes[entry]
+        return matrix_class(num_rows, num_cols, flat_entries)
+
+
+def _load_expression_table(hdf5_handle):
+    """
+    Reconstructs all nodes of the expression table stored at the given HDF5
+    handle. Identical heads are parsed only once.
+    """
+    kinds = hdf5_handle["kinds"][()]
+    heads = hdf5_handle["heads"].asstr()[()]
+    arg_offsets = hdf5_handle["arg_offsets"][()]
+    args = hdf5_handle["args"][()]
+    nodes = []
+    for i, (kind, head) in enumerate(zip(kinds, heads)):
+        if kind == _SympyNodeKind.ATOM:
+            nodes.append(_sympify_cached(head))
+            continue
+        if kind == _SympyNodeKind.CLASS:
+            func = _import_class(head)
+        else:
+            func = _sympify_cached(head)
+        nodes.append(
+            func(*(nodes[j] for j in args[arg_offsets[i] : arg_offsets[i + 1]]))
+        )
+    return nodes
@@ -2,7 +2,13 @@
 Module defining the serialization method for sympy objects.
 """
 
+import importlib
+from functools import lru_cache
+
+import h5py
+import numpy as np
 import sympy
+from sympy.core.function import UndefinedFunction
 
 from ._special_types import (
     _SpecialTypeTags,
@@ -10,10 +16,137 @@ from ._special_types import (
     add_type_tag,
     to_hdf5_singledispatch,
 )
+from ._sympy_load import _SympyNodeKind
 
 
 @to_hdf5_singledispatch.register(sympy.MatrixBase)
+def _(obj, hdf5_handle):
+    if _get_class_path(type(obj)) is None:
+        _legacy_serializer(obj, hdf5_handle)
+    else:
+        _matrix_serializer(obj, hdf5_handle)
+
+
 @to_hdf5_singledispatch.register(sympy.Basic)
-@add_type_tag(_SpecialTypeTags.SYMPY)
+@add_type_tag(_SpecialTypeTags.SYMPY_EXPRESSION)
 def _(obj, hdf5_handle):
+    table = _ExpressionTable()
+    hdf5_handle["root"] = table.add(obj)
+    table.to_hdf5(hdf5_handle)
+
+
+@add_type_tag(_SpecialTypeTags.SYMPY)
+def _legacy_serializer(obj, hdf5_handle):
     _value_serializer(sympy.srepr(obj), hdf5_handle)
+
+
+@add_type_tag(_SpecialTypeTags.SYMPY_MATRIX)
+def _matrix_serializer(obj, hdf5_handle):
+    """
+    Stores the non-zero entries of a matrix in coordinate format, as indices
+    into an expression table shared by all entries.
+    """
+    table = _ExpressionTable()
+    nonzero = sorted(obj.todok().items())
+    hdf5_handle["matrix_class"] = _get_class_path(type(obj))
+    hdf5_handle["shape"] = np.array(obj.shape, dtype=np.int64)
+    hdf5_handle["row"] = np.array([pos[0] for pos, _ in nonzero], dtype=np.int64)
+    hdf5_handle["col"] = np.array([pos[1] for pos, _ in nonzero], dtype=np.int64)
+    hdf5_handle["entry"] = np.array(
+        [table.add(value) for _, value in nonzero], dtype=np.int64
+    )
+    table.to_hdf5(hdf5_handle)
+
+
+class _ExpressionTable:
+    """
+    Table of sympy expression nodes, in which every distinct sub-expression
+    is stored only once. The arguments of a node are stored before the node
+    itself.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._kinds = []
+        self._heads = []
+        self._arg_offsets = [0]
+        self._args = []
+
+    def add(self, expr):
+        """
+        Adds the given expression to the table, returning its index.
+        """
+        stack = [(expr, False)]
+        while stack:
+            node, args_added = stack.pop()
+            key = (type(node), node)
+            if key in self._index:
+                continue
+            kind, head = _get_head(node)
+            if kind == _SympyNodeKind.ATOM:
+                self._append(key, kind, head, ())
+            elif args_added:
+                self._append(
+                    key,
+                    kind,
+                    head,
+                    [self._index[(type(arg), arg)] for arg in node.args],
+                )
+            else:
+                stack.append((node, True))
+                stack.extend((arg, False) for arg in reversed(node.args))
+        return self._index[(type(expr), expr)]
+
+    def _append(self, key, kind, head, args):
+        self._index[key] = len(self._kinds)
+        self._kinds.append(kind)
+        self._heads.append(head)
+        self._args.extend(args)
+        self._arg_offsets.append(len(self._args))
+
+    def to_hdf5(self, hdf5_handle):
+        """
+        Writes the table to the given HDF5 handle.
+        """
+        hdf5_handle["kinds"] = np.array(self._kinds, dtype=np.uint8)
+        hdf5_handle.create_dataset(
+            "heads",
+            data=self._heads,
+            shape=(len(self._heads),),
+            dtype=h5py.string_dtype(),
+        )
+        hdf5_handle["arg_offsets"] = np.array(self._arg_offsets, dtype=np.int64)
+        hdf5_handle["args"] = np.array(self._args, dtype=np.int64)
+
+
+def _get_head(node):
+    """
+    Returns the kind and head of a node in the expression table. Nodes whose
+    head cannot be identified are stored as a whole, using ``srepr``.
+    """
+    if node.is_Atom:
+        return _SympyNodeKind.ATOM, sympy.srepr(node)
+    if isinstance(node.func, UndefinedFunction):
+        return _SympyNodeKind.FUNCTION, sympy.srepr(node.func)
+    class_path = _get_class_path(node.func)
+    if class_path is None:
+        return _SympyNodeKind.ATOM, sympy.srepr(node)
+    return _SympyNodeKind.CLASS, class_path
+
+
+@lru_cache(maxsize=None)
+def _get_class_path(cls):
+    """
+    Returns the full import path of a sympy class, or ``None`` if the class
+    cannot be imported from its module.
+    """
+    module_name = getattr(cls, "__module__", None)
+    name = getattr(cls, "__qualname__", None)
+    if module_name is None or name is None or not module_name.startswith("sympy."):
+        return None
+    try:
+        if getattr(importlib.import_module(module_name), name) is not cls:
+            return None
+    except (ImportError, AttributeError):
+        return None
+    return f"{module_name}.{name}"
@@ -46,11 +46,23 @@ setup(
             "ipython>=6.2",
             "matplotlib",
             "sympy",
+            "scipy",
+            "pandas",
+            "zarr",
         ]
     },
     entry_points={
-        "fsc.hdf5_io.load": ["sympy.object = fsc.hdf5_io._sympy_load"],
-        "fsc.hdf5_io.save": ["sympy = fsc.hdf5_io._sympy_save"],
+        "fsc.hdf5_io.load": [
+            "sympy.object = fsc.hdf5_io._sympy_load",
+            "scipy.sparse = fsc.hdf5_io._scipy_sparse_load",
+            "pandas = fsc.hdf5_io._pandas_load",
+        ],
+        "fsc.hdf5_io.save": [
+            "sympy = fsc.hdf5_io._sympy_save",
+            "scipy.sparse = fsc.hdf5_io._scipy_sparse_save",
+            "pandas = fsc.hdf5_io._pandas_save",
+        ],
+        "console_scripts": ["fsc-hdf5-io = fsc.hdf5_io._cli:main"],
     },
     long_description=README,
     classifiers=[
@@ -71,6 +71,21 @@ class AutoClassWithOptional(AutoClass):
         return True
 
 
+@subscribe_hdf5("test.auto_class_with_precision")
+class AutoClassWithPrecision(SimpleHDF5Mapping):
+    """
+    Class which uses the automatic serialization, storing one attribute with
+    reduced precision.
+    """
+
+    HDF5_ATTRIBUTES = ["x", "y"]
+    HDF5_PRECISION = {"x": "float16"}
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
 @subscribe_hdf5("test.auto_class_child")
 class AutoClassChild(AutoClass):
     """
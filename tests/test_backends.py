@@ -0,0 +1,99 @@
+"""
+Tests for saving and loading with storage backends other than HDF5.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from numpy.testing import assert_equal
+from simple_class import AutoClass, SimpleClass
+
+from fsc.hdf5_io import DirectoryStore, MemoryStore, load, save
+
+OBJECTS = [
+    SimpleClass(3),
+    AutoClass(x=1, y="y"),
+    {"a": [2, "x", None], "b": {"c": np.arange(6).reshape(2, 3)}},
+    [1.5, 2j, b"bytes", ("a", (1, 2)), np.array(["foo", "barbaz"])],
+]
+
+
+@pytest.mark.parametrize("obj", OBJECTS)
+def test_zarr(tmpdir, obj):
+    """
+    Test saving and loading with the zarr backend.
+    """
+    pytest.importorskip("zarr")
+    path = str(tmpdir / "store.zarr")
+    save(obj, path, backend="zarr")
+    assert_equal(load(path, backend="zarr"), obj)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("obj", OBJECTS)
+def test_directory(tmpdir, obj, compact):
+    """
+    Test saving and loading with the directory backend, and re-saving to
+    the same directory.
+    """
+    path = str(tmpdir / "store")
+    save(obj, path, backend="directory", compact=compact)
+    save(obj, path, backend="directory", compact=compact)
+    assert_equal(load(path, backend="directory"), obj)
+    with DirectoryStore(path) as store:
+        assert_equal(load(store), obj)
+
+
+def test_directory_layout(tmpdir):
+    """
+    Test that the directory backend stores arrays as .npy files.
+    """
+    path = str(tmpdir / "store")
+    save(np.arange(5), path, backend="directory")
+    assert_equal(np.load(os.path.join(path, "value.npy")), np.arange(5))
+
+
+def test_directory_no_overwrite(tmpdir):
+    """
+    Test that a directory which is not a store is not overwritten.
+    """
+    (tmpdir / "data.txt").write("content")
+    with pytest.raises(FileExistsError):
+        save(1, str(tmpdir), backend="directory")
+    assert (tmpdir / "data.txt").read() == "content"
+
+
+def test_dataset_slices():
+    """
+    Test writing slices of a dataset created without data.
+    """
+    store = MemoryStore()
+    dataset = store.root.create_dataset("x", shape=(4, 2), dtype=float)
+    dataset[1:3] = np.ones((2, 2))
+    assert dataset.shape == (4, 2)
+    assert_equal(dataset[()], [[0, 0], [1, 1], [1, 1], [0, 0]])
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"atomic": True},
+        {"profile": "many-small-objects"},
+        {"file_options": {"libver": "latest"}},
+    ],
+)
+def test_hdf5_only_arguments(kwargs):
+    """
+    Test that HDF5-specific arguments are rejected for other backends.
+    """
+    with pytest.raises(ValueError):
+        save(1, MemoryStore(), **kwargs)
+
+
+def test_unknown_backend(tmpdir):
+    """
+    Test that an unknown backend raises an error.
+    """
+    with pytest.raises(ValueError):
+        save(1, str(tmpdir / "store"), backend="invalid")
@@ -0,0 +1,56 @@
+"""
+Tests for saving objects in the background.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+from numpy.testing import assert_equal
+from simple_class import AutoClass, SimpleClass
+
+from fsc.hdf5_io import load, save_in_background, to_hdf5_file
+
+
+def test_snapshot():
+    """
+    Check that modifications after calling 'save_in_background' do not
+    affect the saved object.
+    """
+    arr = np.arange(10)
+    x = {"a": arr, "b": [1, SimpleClass(2)], "c": AutoClass(x=1, y=[2])}
+    expected = {"a": arr.copy(), "b": [1, SimpleClass(2)], "c": AutoClass(x=1, y=[2])}
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = os.path.join(dirname, "checkpoint.hdf5")
+        future = save_in_background(x, filename)
+        arr[:] = -1
+        x["b"].append(3)
+        x["c"].y.append(3)
+        assert future.result() == filename
+        assert_equal(load(filename), expected)
+        assert os.listdir(dirname) == ["checkpoint.hdf5"]
+
+
+def test_readonly_view():
+    """
+    Check that arrays are snapshotted as read-only views if 'copy_arrays' is
+    not set.
+    """
+    arr = np.arange(5)
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = os.path.join(dirname, "checkpoint.hdf5")
+        save_in_background([arr], filename, copy_arrays=False).result()
+        assert_equal(load(filename), [arr])
+
+
+def test_atomic_save_error():
+    """
+    Check that a failed atomic save leaves an existing file untouched.
+    """
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = os.path.join(dirname, "data.hdf5")
+        to_hdf5_file([1, 2], filename, atomic=True)
+        future = save_in_background([lambda x: x], filename)
+        assert isinstance(future.exception(), TypeError)
+        assert_equal(load(filename), [1, 2])
+        assert os.listdir(dirname) == ["data.hdf5"]
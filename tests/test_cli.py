@@ -0,0 +1,99 @@
+"""
+Tests for the command line interface.
+"""
+
+import h5py
+import numpy as np
+import pytest
+from numpy.testing import assert_equal
+
+from fsc.hdf5_io import load, save
+from fsc.hdf5_io._cli import main
+
+OBJ = {"a": [1, 2.5, "x", None, b"y"], "b": np.arange(100.0)}
+
+
+@pytest.fixture
+def hdf5_file(tmp_path):
+    """
+    Returns the path of a file containing a nested object.
+    """
+    file_name = str(tmp_path / "obj.hdf5")
+    save(OBJ, file_name)
+    return file_name
+
+
+def test_inspect(hdf5_file, capsys):  # pylint: disable=redefined-outer-name
+    """
+    Test printing the object tree.
+    """
+    assert main(["inspect", hdf5_file]) == 0
+    output = capsys.readouterr().out
+    assert output.startswith("/ <builtins.dict>\n")
+    assert "<builtins.none>" in output
+    assert "value: float64 (100,), 800 bytes" in output
+
+
+def test_inspect_max_depth(hdf5_file, capsys):  # pylint: disable=redefined-outer-name
+    """
+    Test limiting the depth of the printed tree.
+    """
+    assert main(["inspect", hdf5_file, "--max-depth", "1"]) == 0
+    assert capsys.readouterr().out == "/ <builtins.dict>\n  items <builtins.list>\n"
+
+
+def test_stats(hdf5_file, capsys):  # pylint: disable=redefined-outer-name
+    """
+    Test the object counts reported by the stats command.
+    """
+    assert main(["stats", hdf5_file]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert "  groups:         13" in lines
+    assert "    builtins.number               2" in lines
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_repack(hdf5_file, tmp_path, jobs):  # pylint: disable=redefined-outer-name
+    """
+    Test repacking to an output directory with compact storage and
+    compression.
+    """
+    output_dir = tmp_path / "out"
+    assert (
+        main(
+            [
+                "repack",
+                hdf5_file,
+                "-o",
+                str(output_dir),
+                "--compression",
+                "gzip",
+                "-j",
+                jobs,
+            ]
+        )
+        == 0
+    )
+    target = str(output_dir / "obj.hdf5")
+    assert_equal(load(target), OBJ)
+    with h5py.File(target, "r") as hdf5_file_handle:
+        assert "0" not in hdf5_file_handle["items/0/1"]
+        assert hdf5_file_handle["items/1/1/value"].compression == "gzip"
+
+
+def test_repack_in_place(hdf5_file):  # pylint: disable=redefined-outer-name
+    """
+    Test repacking a file in place.
+    """
+    assert main(["repack", hdf5_file, "-j", "1"]) == 0
+    assert_equal(load(hdf5_file), OBJ)
+
+
+def test_repack_error(tmp_path, capsys):
+    """
+    Test that a file which cannot be repacked is reported.
+    """
+    invalid_file = tmp_path / "invalid.hdf5"
+    invalid_file.write_text("not HDF5")
+    assert main(["repack", str(invalid_file), "-j", "1"]) == 1
+    assert "invalid.hdf5: failed" in capsys.readouterr().err
@@ -0,0 +1,95 @@
+"""
+Tests for loading files with a cache of load plans.
+"""
+
+import h5py
+import numpy as np
+import pytest
+from numpy.testing import assert_equal
+from simple_class import AutoClass, SimpleClass
+
+from fsc.hdf5_io import LoadPlanCache, MemoryStore, load, save
+
+
+def _nested_list(depth):
+    res = []
+    for _ in range(depth):
+        res = [res, 1]
+    return res
+
+
+OBJECTS = [
+    {"a": [1, 2.5, "s", None, np.arange(3), b"x", (1, "y")], 3: {"b": 1j}},
+    [SimpleClass(2), AutoClass(x=1, y="y"), [np.array(["a", "bc"]), []]],
+    (np.array([1, "a"], dtype=object), np.zeros((2, 3), dtype=np.float32)),
+    _nested_list(5000),
+    1.5,
+]
+
+
+@pytest.mark.parametrize("obj", OBJECTS)
+@pytest.mark.parametrize("compact", [False, True])
+def test_load_plan(obj, compact, tmp_path):
+    """
+    Check that loading with a plan gives the same result as loading without
+    one, for the file the plan is created from and for a further file.
+    """
+    cache = LoadPlanCache()
+    save(obj, tmp_path / "a.hdf5", compact=compact)
+    save(obj, tmp_path / "b.hdf5", compact=compact)
+    expected = load(tmp_path / "a.hdf5")
+    for file_name in ["a.hdf5", "b.hdf5"]:
+        res = load(tmp_path / file_name, plan_cache=cache)
+        assert_equal(res, expected)
+        assert type(res) is type(expected)
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_load_plan_values(tmp_path):
+    """
+    Check that a plan loads the values of each file, and that different
+    structures get different plans.
+    """
+    cache = LoadPlanCache()
+    objects = [[1, "a", (2.5, None)], [2, "b", (3.5, None)], [1, "a", (2.5,)]]
+    for i, obj in enumerate(objects):
+        save(obj, tmp_path / f"{i}.hdf5")
+        assert load(tmp_path / f"{i}.hdf5", plan_cache=cache) == obj
+    assert (cache.misses, cache.hits) == (2, 1)
+
+
+def test_load_plan_group(tmp_path):
+    """
+    Check loading from a group of a file with a plan.
+    """
+    cache = LoadPlanCache()
+    save([[1, 2]], tmp_path / "list.hdf5")
+    with h5py.File(tmp_path / "list.hdf5", "r") as hdf5_file:
+        assert cache.from_hdf5(hdf5_file["0"]) == [1, 2]
+        assert cache.from_hdf5(hdf5_file) == [[1, 2]]
+
+
+def test_load_plan_maxsize(tmp_path):
+    """
+    Check that the least recently used plans are removed.
+    """
+    cache = LoadPlanCache(maxsize=2)
+    for i in range(3):
+        save(list(range(i)), tmp_path / f"{i}.hdf5")
+    for i in [0, 1, 0, 2, 0, 1]:
+        load(tmp_path / f"{i}.hdf5", plan_cache=cache)
+    assert (cache.misses, cache.hits) == (4, 2)
+    cache.clear()
+    load(tmp_path / "0.hdf5", plan_cache=cache)
+    assert cache.misses == 5
+
+
+def test_load_plan_store():
+    """
+    Check that stores other than HDF5 are loaded without a plan.
+    """
+    cache = LoadPlanCache()
+    store = MemoryStore()
+    save([1, 2], store)
+    assert load(store, plan_cache=cache) == [1, 2]
+    assert (cache.misses, cache.hits) == (0, 0)
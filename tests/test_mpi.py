@@ -0,0 +1,78 @@
+"""
+Tests for saving and loading distributed arrays with MPI. These tests are
+skipped if mpi4py is not installed, or h5py is built without MPI support.
+
+To test with multiple ranks, run ``mpirun -n 4 python -m pytest tests/test_mpi.py``.
+"""
+
+import os
+import tempfile
+
+import h5py
+import numpy as np
+import pytest
+from numpy.testing import assert_equal
+
+MPI = pytest.importorskip("mpi4py.MPI")
+if not h5py.get_config().mpi:
+    pytest.skip("h5py is built without MPI support", allow_module_level=True)
+
+from fsc.hdf5_io import DistributedArray, load, save
+
+
+@pytest.fixture
+def shared_filename():
+    """
+    Returns a file name which is the same on all ranks.
+    """
+    comm = MPI.COMM_WORLD
+    dirname = tempfile.mkdtemp() if comm.rank == 0 else None
+    dirname = comm.bcast(dirname, root=0)
+    yield os.path.join(dirname, "distributed.hdf5")
+    comm.Barrier()
+    if comm.rank == 0:
+        if os.path.exists(os.path.join(dirname, "distributed.hdf5")):
+            os.remove(os.path.join(dirname, "distributed.hdf5"))
+        os.rmdir(dirname)
+
+
+@pytest.mark.parametrize("atomic", [False, True])
+@pytest.mark.parametrize("axis", [0, 1])
+def test_distributed_array(
+    shared_filename, axis, atomic
+):  # pylint: disable=redefined-outer-name
+    """
+    Check that a distributed array is written collectively, can be loaded
+    serially as a regular array, and collectively as a distributed array.
+    """
+    comm = MPI.COMM_WORLD
+    local_size = comm.rank + 1
+    local_shape = [3, 3]
+    local_shape[axis] = local_size
+    local_array = np.full(local_shape, comm.rank, dtype=float)
+    save(
+        {"a": DistributedArray(local_array, comm=comm, axis=axis), "b": [1, 2]},
+        shared_filename,
+        comm=comm,
+        atomic=atomic,
+    )
+    comm.Barrier()
+
+    expected = np.concatenate(
+        [
+            np.full(local_shape[:axis] + [r + 1] + local_shape[axis + 1 :], r)
+            for r in range(comm.size)
+        ],
+        axis=axis,
+    )
+    if comm.rank == 0:
+        res = load(shared_filename)
+        assert_equal(res["a"], expected)
+        assert_equal(res["b"], [1, 2])
+    comm.Barrier()
+
+    res = load(shared_filename, comm=comm)
+    assert isinstance(res["a"], DistributedArray)
+    assert res["a"].global_shape == expected.shape
+    assert_equal(res["a"].local_array, expected[res["a"].local_selection])
+    assert_equal(res["b"], [1, 2])
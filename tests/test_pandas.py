@@ -0,0 +1,137 @@
+"""
+Run tests for saving / loading pandas objects. These tests are skipped if
+pandas is not installed.
+"""
+
+import subprocess
+import sys
+
+import h5py
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from fsc.hdf5_io import MemoryStore, from_hdf5, load, save
+
+
+def _example_frame():
+    return pd.DataFrame(
+        {
+            "int": np.arange(4),
+            "float": [1.5, np.nan, 2, 3],
+            "str": ["a", None, "c", "d"],
+            "object": pd.Series(["x", "y", "z", "w"], dtype=object),
+            "mixed": [1, "a", 2.5, None],
+            "category": pd.Categorical(["u", "v", "u", "u"], ordered=True),
+            "datetime": pd.date_range("2020", periods=4),
+            "datetime_tz": pd.date_range("2020", periods=4, tz="Europe/Berlin"),
+            "timedelta": pd.to_timedelta([1, 2, 3, 4], unit="s"),
+            "nullable_int": pd.array([1, None, 3, 4], dtype="Int64"),
+            "nullable_bool": pd.array([True, None, False, True], dtype="boolean"),
+            2: np.ones(4, dtype=np.float32),
+        },
+        index=pd.Index(["r1", "r2", "r3", "r4"], name="row"),
+    )
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        _example_frame(),
+        _example_frame().set_index(["int", "category"]),
+        pd.DataFrame(
+            np.zeros((3, 2)), columns=pd.MultiIndex.from_tuples([(1, "a"), (1, "b")])
+        ),
+        pd.DataFrame(),
+        pd.DataFrame(index=pd.RangeIndex(2, 10, 3)),
+    ],
+)
+def test_dataframe(obj, tmp_path):
+    """
+    Check that DataFrames keep their dtypes, index and column labels.
+    """
+    save(obj, tmp_path / "obj.hdf5")
+    pd.testing.assert_frame_equal(load(tmp_path / "obj.hdf5"), obj)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        pd.Series([1, 2, 3], name=("a", 1)),
+        pd.Series(pd.Categorical(["a", "b"]), index=pd.Index([3.5, 1.0])),
+        pd.Index(["a", "b"], name="x"),
+        pd.date_range("2020", periods=3, freq="D", name="date"),
+    ],
+)
+def test_series_index(obj, tmp_path):
+    """
+    Check saving and loading Series and Index objects.
+    """
+    save(obj, tmp_path / "obj.hdf5")
+    res = load(tmp_path / "obj.hdf5")
+    if isinstance(obj, pd.Series):
+        pd.testing.assert_series_equal(res, obj)
+    else:
+        pd.testing.assert_index_equal(res, obj, exact="equiv")
+
+
+def test_dataframe_layout(tmp_path):
+    """
+    Check that each column is stored as a single dataset, and categoricals
+    as codes and categories.
+    """
+    obj = _example_frame()
+    save(obj, tmp_path / "obj.hdf5")
+    with h5py.File(tmp_path / "obj.hdf5", "r") as hdf5_file:
+        assert hdf5_file["type_tag"][()] == b"pandas.dataframe"
+        assert hdf5_file["data/0/values"].shape == (4,)
+        assert hdf5_file["data/5/codes"].dtype == np.int8
+        assert "range" not in hdf5_file["index"]
+
+
+def test_dataframe_columns(tmp_path):
+    """
+    Check loading a subset of the columns, also from a nested object.
+    """
+    obj = _example_frame()
+    save({"table": obj}, tmp_path / "obj.hdf5")
+    with h5py.File(tmp_path / "obj.hdf5", "r") as hdf5_file:
+        res = from_hdf5(hdf5_file["items/0/1"], columns=["category", 2])
+        with pytest.raises(KeyError):
+            from_hdf5(hdf5_file["items/0/1"], columns=["invalid"])
+    pd.testing.assert_frame_equal(res, obj[["category", 2]])
+
+
+def test_dataframe_store():
+    """
+    Check saving a DataFrame to a store other than HDF5, and loading a
+    subset of its columns.
+    """
+    obj = _example_frame()
+    store = MemoryStore()
+    save(obj, store)
+    pd.testing.assert_frame_equal(load(store, columns=["str"]), obj[["str"]])
+
+
+def test_pandas_entry_points(tmp_path):
+    """
+    Check that the pandas handlers are loaded through the entry points.
+    """
+    file_name = str(tmp_path / "obj.hdf5")
+    code = f"""
+import sys
+import pandas as pd
+from fsc.hdf5_io import save
+save(pd.DataFrame({{"a": [1, 2]}}), {file_name!r})
+assert "fsc.hdf5_io._pandas_save" in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
+    code = f"""
+import sys
+from fsc.hdf5_io import load
+assert "pandas" not in sys.modules
+assert list(load({file_name!r})["a"]) == [1, 2]
+assert "fsc.hdf5_io._pandas_load" in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -2,7 +2,10 @@
 Tests for saving and loading a simple class.
 """
 
+import os
+import sys
 import tempfile
+import tracemalloc
 
 import h5py
 import numpy as np
@@ -12,6 +15,7 @@ from simple_class import (
     AutoClass,
     AutoClassChild,
     AutoClassWithOptional,
+    AutoClassWithPrecision,
     ClashingKeys,
     InvalidAttributeKeyType,
     InvalidOptionalKeyType,
@@ -19,10 +23,10 @@ from simple_class import (
     SimpleClass,
 )
 
-from fsc.hdf5_io import load, save
+from fsc.hdf5_io import MemoryStore, load, save
 
 
-@pytest.fixture(params=["tempfile", "permanent"])
+@pytest.fixture(params=["tempfile", "permanent", "directory", "memory"])
 def check_save_load(request, test_name, sample_dir):
     """
     Check that a given object remains the same when saved and loaded.
@@ -46,9 +50,24 @@ def check_save_load(request, test_name, sample_dir):
             save(x, file_name)
             raise ValueError("Sample file did not exist") from exc
 
-    if request.param == "tempfile":
-        return inner_tempfile
-    return inner_permanent
+    def inner_directory(x):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save(x, os.path.join(tmpdir, "store"), backend="directory")
+            y = load(os.path.join(tmpdir, "store"), backend="directory")
+        assert_equal(x, y)
+
+    def inner_memory(x):
+        store = MemoryStore()
+        save(x, store)
+        y = load(store)
+        assert_equal(x, y)
+
+    return {
+        "tempfile": inner_tempfile,
+        "permanent": inner_permanent,
+        "directory": inner_directory,
+        "memory": inner_memory,
+    }[request.param]
 
 
 def test_file_freefunc(check_save_load):  # pylint: disable=redefined-outer-name
@@ -202,6 +221,11 @@ def test_legacyclass_notag(sample_dir):
         np.array(["foo", "bar", "baz"]),
         (np.array(["foo", "bar", "baz"]),),
         np.array([[1, 2], [4, 5]], dtype=[("age", "i4"), ("weight", "f4")]),
+        np.array([["a", "bc"], ["déf", ""]]),
+        np.array(["foo", "bar"], dtype=object),
+        np.array([[1, 2], [3, 4]], dtype=object),
+        np.array(1.5 + 2j, dtype=object),
+        np.array("foo"),
     ],
 )
 def test_numpy_array(check_save_load, obj):  # pylint: disable=redefined-outer-name
@@ -211,6 +235,161 @@ def test_numpy_array(check_save_load, obj):  # pylint: disable=redefined-outer-n
     check_save_load(obj)
 
 
+@pytest.mark.parametrize(
+    "obj",
+    [
+        np.array([["a", "bc"], ["déf", ""]]),
+        np.array(["foo", "bar"], dtype=object),
+        np.array([[True, False]], dtype=object),
+        np.array([], dtype="U3"),
+    ],
+)
+def test_numpy_array_native(obj):
+    """
+    Check that string and primitive object arrays are stored in a single
+    dataset, and keep their dtype and element types.
+    """
+    with tempfile.NamedTemporaryFile() as named_file:
+        save(obj, named_file.name)
+        with h5py.File(named_file.name, "r") as hdf5_file:
+            assert isinstance(hdf5_file["value"], h5py.Dataset)
+        res = load(named_file.name)
+    assert res.dtype == obj.dtype
+    assert res.shape == obj.shape
+    assert [type(x) for x in res.flat] == [type(x) for x in obj.flat]
+    assert_equal(res, obj)
+
+
+@pytest.mark.parametrize(
+    "precision, stored_dtype, atol",
+    [
+        ("float32", np.float32, 1e-6),
+        ("float16", np.float16, 1e-2),
+        (np.float16, np.float16, 1e-2),
+        (("scaleoffset", 3), np.float64, 5e-4),
+        (("bitround", 3), np.float64, 1e-2),
+        ("float64", np.float64, 0),
+    ],
+)
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_precision(precision, stored_dtype, atol, dtype, tmp_path):
+    """
+    Check storing floating-point arrays with reduced precision.
+    """
+    obj = np.linspace(-3, 3, 1000, dtype=dtype).reshape(10, 100)
+    file_name = tmp_path / "obj.hdf5"
+    save([obj, np.arange(3), 1.5], file_name, precision=precision, block_size=128)
+    res, int_array, number = load(file_name)
+    assert res.dtype == obj.dtype
+    np.testing.assert_allclose(res, obj, rtol=0, atol=atol)
+    assert_equal(int_array, np.arange(3))
+    assert number == 1.5
+    with h5py.File(file_name, "r") as hdf5_file:
+        if np.dtype(stored_dtype).itemsize > obj.itemsize:
+            stored_dtype = obj.dtype
+        assert hdf5_file["0/value"].dtype == stored_dtype
+
+
+@pytest.mark.parametrize("precision", ["int32", ("invalid", 3)])
+def test_invalid_precision(precision, tmp_path):
+    """
+    Check that an invalid precision raises an error.
+    """
+    with pytest.raises(ValueError):
+        save(np.zeros(3), tmp_path / "obj.hdf5", precision=precision)
+
+
+def test_precision_attribute(tmp_path):
+    """
+    Check the per-attribute precision of a SimpleHDF5Mapping.
+    """
+    obj = AutoClassWithPrecision(x=np.linspace(0, 1, 11), y=np.linspace(0, 1, 11))
+    save(obj, tmp_path / "obj.hdf5")
+    with h5py.File(tmp_path / "obj.hdf5", "r") as hdf5_file:
+        assert hdf5_file["x/value"].dtype == np.float16
+        assert hdf5_file["y"].dtype == np.float64
+    res = load(tmp_path / "obj.hdf5")
+    assert res.x.dtype == np.float64
+    np.testing.assert_allclose(res.x, obj.x, atol=1e-3)
+    assert_equal(res.y, obj.y)
+
+
+_BLOCK_ARRAY = np.arange(240.0).reshape(8, 6, 5)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        _BLOCK_ARRAY,
+        _BLOCK_ARRAY[:, ::2],
+        _BLOCK_ARRAY.T,
+        _BLOCK_ARRAY[::-1, 1:, 2],
+    ],
+)
+@pytest.mark.parametrize("block_size", [1, 8, 50, 300, 2**20])
+def test_block_write(obj, block_size, tmp_path):
+    """
+    Check saving arrays and strided views in blocks, and copying datasets
+    of another file.
+    """
+    with tempfile.NamedTemporaryFile() as named_file:
+        save(obj, named_file.name, block_size=block_size)
+        assert_equal(load(named_file.name), obj)
+        with h5py.File(named_file.name, "r") as hdf5_file:
+            save(hdf5_file["value"], tmp_path / "copy.hdf5", block_size=block_size)
+    assert_equal(load(tmp_path / "copy.hdf5"), obj)
+
+
+def test_block_write_memory(tmp_path):
+    """
+    Check that saving a strided view of a memory-mapped array does not
+    copy the whole array.
+    """
+    array = np.lib.format.open_memmap(
+        tmp_path / "array.npy", mode="w+", dtype=float, shape=(1000, 2000)
+    )
+    array[:] = np.arange(2000.0)
+    view = array[:, ::2]
+    tracemalloc.start()
+    try:
+        save(view, tmp_path / "view.hdf5", block_size=2**16)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < view.nbytes / 10
+    assert_equal(load(tmp_path / "view.hdf5"), view)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        [1, 2.5, 1 + 2j, True, np.float32(1.5), None, "foo", "", "x" * 2000],
+        (b"bar", b"", [None, "a"]),
+        {"a": 1, (1, 2): None, "b": [SimpleClass(3), "c"]},
+        np.array([1, 2.0, None, "foo"], dtype=object),
+    ],
+)
+def test_compact(obj):
+    """
+    Check save / load in compact mode, and that fewer HDF5 objects are created.
+    """
+    with tempfile.NamedTemporaryFile() as named_file:
+        save(obj, named_file.name)
+        with h5py.File(named_file.name, "r") as hdf5_file:
+            num_objects = _count_objects(hdf5_file)
+        save(obj, named_file.name, compact=True)
+        with h5py.File(named_file.name, "r") as hdf5_file:
+            assert _count_objects(hdf5_file) < num_objects
+        res = load(named_file.name)
+    assert_equal(res, obj)
+
+
+def _count_objects(hdf5_file):
+    names = []
+    hdf5_file.visit(names.append)
+    return len(names)
+
+
 def test_unhashable_dict_key(sample_dir):
     """
     Test loading an invalid dictionary with keys that can not be made
@@ -244,3 +423,69 @@ def test_incorrect_key_check(obj):
     with tempfile.NamedTemporaryFile() as tmpf:
         with pytest.raises(ValueError):
             save(obj, tmpf.name)
+
+
+def test_deep_nesting():
+    """
+    Test that nesting deeper than the Python recursion limit can be saved and loaded.
+    """
+    depth = 2 * sys.getrecursionlimit()
+    x = []
+    current = x
+    for _ in range(depth):
+        current.append([])
+        current = current[0]
+    with tempfile.NamedTemporaryFile() as named_file:
+        save(x, named_file.name)
+        y = load(named_file.name)
+    for _ in range(depth):
+        assert len(y) == 1
+        y = y[0]
+    assert y == []
+
+
+def test_unknown_save_option():
+    """
+    Check that passing an unknown save option raises a TypeError.
+    """
+    with tempfile.NamedTemporaryFile() as named_file:
+        with pytest.raises(TypeError):
+            save([1, 2], named_file.name, inexistent_option=True)
+
+
+@pytest.mark.parametrize("profile", [None, "many-small-objects", "few-large-arrays"])
+def test_file_profile(profile):
+    """
+    Check save / load with the different file profiles.
+    """
+    x = {"a": [1, 2.0, "b"], "c": np.arange(10)}
+    with tempfile.NamedTemporaryFile() as named_file:
+        save(x, named_file.name, profile=profile)
+        y = load(named_file.name, profile=profile)
+    assert_equal(x, y)
+
+
+def test_file_options():
+    """
+    Check that raw file options take precedence over the profile.
+    """
+    with tempfile.NamedTemporaryFile() as named_file:
+        save(
+            [1, 2],
+            named_file.name,
+            profile="many-small-objects",
+            file_options={"fs_page_size": 8192},
+        )
+        with h5py.File(named_file.name, "r") as hdf5_file:
+            create_plist = hdf5_file.id.get_create_plist()
+            assert create_plist.get_file_space_page_size() == 8192
+        assert_equal(load(named_file.name, file_options={"rdcc_nbytes": 0}), [1, 2])
+
+
+def test_invalid_profile():
+    """
+    Check that an unknown file profile raises a ValueError.
+    """
+    with tempfile.NamedTemporaryFile() as named_file:
+        with pytest.raises(ValueError):
+            save([1, 2], named_file.name, profile="inexistent")
@@ -0,0 +1,93 @@
+"""
+Run tests for saving / loading scipy.sparse matrices. These tests are skipped
+if scipy is not installed.
+"""
+
+import subprocess
+import sys
+
+import h5py
+import numpy as np
+import pytest
+
+scipy_sparse = pytest.importorskip("scipy.sparse")
+
+from fsc.hdf5_io import MemoryStore, load, save
+
+_DENSE = np.array([[0, 1.5, 0, 0], [2, 0, 0, -1], [0, 0, 0, 0], [0, 3, 0, 4]])
+
+
+def _sparse_objects():
+    res = []
+    for sparse_format in ["csr", "csc", "coo", "bsr", "lil", "dok", "dia"]:
+        for suffix in ["matrix", "array"]:
+            cls = getattr(scipy_sparse, f"{sparse_format}_{suffix}", None)
+            if cls is not None:
+                res.append(cls(_DENSE))
+    res.append(scipy_sparse.csr_matrix((3, 5), dtype=np.int32))
+    res.append(scipy_sparse.random(50, 40, density=0.1, format="csc", random_state=0))
+    return res
+
+
+@pytest.mark.parametrize("obj", _sparse_objects())
+def test_scipy_sparse(obj, tmp_path):
+    """
+    Check that sparse matrices keep their type, format, dtype and values.
+    """
+    save([obj, "x"], tmp_path / "obj.hdf5")
+    res, _ = load(tmp_path / "obj.hdf5")
+    assert type(res) is type(obj)
+    assert res.format == obj.format
+    assert res.dtype == obj.dtype
+    assert res.shape == obj.shape
+    np.testing.assert_equal(res.toarray(), obj.toarray())
+
+
+def test_scipy_sparse_layout(tmp_path):
+    """
+    Check that the components are stored as typed datasets.
+    """
+    obj = scipy_sparse.csr_matrix(_DENSE)
+    save(obj, tmp_path / "obj.hdf5")
+    with h5py.File(tmp_path / "obj.hdf5", "r") as hdf5_file:
+        assert hdf5_file["type_tag"][()] == b"scipy.sparse"
+        np.testing.assert_equal(hdf5_file["data"][()], obj.data)
+        np.testing.assert_equal(hdf5_file["indices"][()], obj.indices)
+        np.testing.assert_equal(hdf5_file["indptr"][()], obj.indptr)
+
+
+def test_scipy_sparse_store():
+    """
+    Check saving a sparse matrix to a store other than HDF5.
+    """
+    obj = scipy_sparse.coo_matrix(_DENSE)
+    store = MemoryStore()
+    save(obj, store)
+    np.testing.assert_equal(load(store).toarray(), _DENSE)
+
+
+def test_scipy_entry_points(tmp_path):
+    """
+    Check that scipy is only imported once a sparse matrix is saved or
+    loaded, through the entry points.
+    """
+    file_name = str(tmp_path / "obj.hdf5")
+    code = f"""
+import sys
+from fsc.hdf5_io import load, save
+assert "scipy" not in sys.modules
+save([1, 2], {file_name!r})
+load({file_name!r})
+assert "scipy" not in sys.modules
+import scipy.sparse
+save(scipy.sparse.eye(3, format="csr"), {file_name!r})
+assert "fsc.hdf5_io._scipy_sparse_save" in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
+    code = f"""
+import sys
+from fsc.hdf5_io import load
+assert load({file_name!r}).nnz == 3
+assert "fsc.hdf5_io._scipy_sparse_load" in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
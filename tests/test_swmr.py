@@ -0,0 +1,66 @@
+"""
+Tests for writing and reading arrays in SWMR mode.
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+import numpy as np
+import pytest
+from numpy.testing import assert_equal
+
+from fsc.hdf5_io import SWMRArrayReader, SWMRArrayWriter, load
+
+
+def _write_in_steps(filename, written, proceed):
+    """
+    Appends elements to the file, waiting for 'proceed' between the steps.
+    """
+    with SWMRArrayWriter(filename, dtype=float, shape=(2,)) as writer:
+        writer.append([0, 1])
+        writer.extend([[2, 3], [4, 5]])
+        written.set()
+        proceed.wait()
+        writer.append([6, 7])
+        written.set()
+
+
+def test_read_while_writing():
+    """
+    Check that appended elements can be read while the file is being written.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    written = ctx.Event()
+    proceed = ctx.Event()
+    with tempfile.TemporaryDirectory() as dirname:
+        filename = os.path.join(dirname, "swmr.hdf5")
+        writer = ctx.Process(target=_write_in_steps, args=(filename, written, proceed))
+        writer.start()
+        try:
+            assert written.wait(timeout=60)
+            written.clear()
+            with SWMRArrayReader(filename) as reader:
+                assert_equal(reader.read_new(), [[0, 1], [2, 3], [4, 5]])
+                assert reader.read_new().shape == (0, 2)
+                proceed.set()
+                assert written.wait(timeout=60)
+                assert_equal(reader.read_new(), [[6, 7]])
+                assert len(reader) == 4
+        finally:
+            proceed.set()
+            writer.join(timeout=60)
+        assert writer.exitcode == 0
+        assert_equal(load(filename), np.arange(8).reshape(4, 2))
+
+
+def test_wrong_shape():
+    """
+    Check that appending elements of the wrong shape raises an error.
+    """
+    with tempfile.TemporaryDirectory() as dirname:
+        with SWMRArrayWriter(os.path.join(dirname, "swmr.hdf5"), dtype=int) as writer:
+            writer.append(1)
+            with pytest.raises(ValueError):
+                writer.append([1, 2])
+            assert len(writer) == 1
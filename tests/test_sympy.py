@@ -3,12 +3,17 @@ Run tests for saving / loading sympy objects. These tests are skipped if sympy
 is not installed.
 """
 
+import tempfile
+
+import h5py
 import pytest
 
 sympy = pytest.importorskip("sympy")
 
 from test_save_load import check_save_load  # pylint: disable=unused-import
 
+from fsc.hdf5_io import load, save
+
 
 @pytest.mark.parametrize(
     "obj", [sympy.sympify("Matrix([[1, I], [x, y]])"), sympy.sympify("1 + x + z**2")]
@@ -18,3 +23,39 @@ def test_sympy(check_save_load, obj):  # pylint: disable=redefined-outer-name
     Check save / load for sympy matrices
     """
     check_save_load(obj)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        sympy.sympify("Piecewise((sin(x) * f(y), x > 0), (Rational(1, 3), True))"),
+        sympy.Symbol("a", positive=True) + sympy.Float("2.5"),
+        sympy.ImmutableMatrix([[1, sympy.Symbol("x")], [0, 0]]),
+        sympy.SparseMatrix(3, 4, {(0, 1): sympy.Symbol("x"), (2, 3): 2}),
+        sympy.zeros(0, 3),
+        [sympy.sympify("x + y"), sympy.sympify("Matrix([[x + y, x], [y, 0]])")],
+    ],
+)
+def test_sympy_structured(obj):
+    """
+    Check save / load for sympy objects which are stored as an expression table.
+    """
+    with tempfile.NamedTemporaryFile() as named_file:
+        save(obj, named_file.name)
+        res = load(named_file.name)
+    assert res == obj
+    assert type(res) == type(obj)  # pylint: disable=unidiomatic-typecheck
+
+
+def test_sympy_shared_subexpressions():
+    """
+    Check that common sub-expressions of a matrix are stored only once.
+    """
+    expr = sympy.sympify("sin(x + y)**2 + cos(x + y)")
+    obj = sympy.Matrix(10, 10, [expr] * 100)
+    with tempfile.NamedTemporaryFile() as named_file:
+        save(obj, named_file.name)
+        with h5py.File(named_file.name, "r") as hdf5_file:
+            assert len(hdf5_file["heads"]) == len(set(sympy.preorder_traversal(expr)))
+        res = load(named_file.name)
+    assert res == obj